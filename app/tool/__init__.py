@@ -0,0 +1,12 @@
+from app.tool.base import BaseTool
+from app.tool.bash import Bash
+from app.tool.create_chat_completion import CreateChatCompletion
+from app.tool.planning import PlanningTool
+
+
+__all__ = [
+    "BaseTool",
+    "Bash",
+    "CreateChatCompletion",
+    "PlanningTool",
+]
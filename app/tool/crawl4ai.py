@@ -5,7 +5,7 @@ This tool integrates Crawl4AI, a high-performance web crawler designed for LLMs
 providing fast, precise, and AI-ready data extraction with clean Markdown generation.
 """
 
-import asyncio
+import time
 from typing import List, Union
 from urllib.parse import urlparse
 
@@ -137,11 +137,11 @@ class Crawl4aiTool(BaseTool):
                 for url in valid_urls:
                     try:
                         logger.info(f"🕷️ Crawling URL: {url}")
-                        start_time = asyncio.get_event_loop().time()
+                        start_time = time.monotonic()
 
                         result = await crawler.arun(url=url, config=run_config)
 
-                        end_time = asyncio.get_event_loop().time()
+                        end_time = time.monotonic()
                         execution_time = end_time - start_time
 
                         if result.success:
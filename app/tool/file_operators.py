@@ -1,6 +1,7 @@
 """File operation interfaces and implementations for local and sandbox environments."""
 
 import asyncio
+import shlex
 from pathlib import Path
 from typing import Optional, Protocol, Tuple, Union, runtime_checkable
 
@@ -124,7 +125,7 @@ class SandboxFileOperator(FileOperator):
         """Check if path points to a directory in sandbox."""
         await self._ensure_sandbox_initialized()
         result = await self.sandbox_client.run_command(
-            f"test -d {path} && echo 'true' || echo 'false'"
+            f"test -d {shlex.quote(str(path))} && echo 'true' || echo 'false'"
         )
         return result.strip() == "true"
 
@@ -132,7 +133,7 @@ class SandboxFileOperator(FileOperator):
         """Check if path exists in sandbox."""
         await self._ensure_sandbox_initialized()
         result = await self.sandbox_client.run_command(
-            f"test -e {path} && echo 'true' || echo 'false'"
+            f"test -e {shlex.quote(str(path))} && echo 'true' || echo 'false'"
         )
         return result.strip() == "true"
 
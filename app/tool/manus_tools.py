@@ -2,27 +2,836 @@
 import os
 import re
 import glob
+import fnmatch
 import asyncio
 import subprocess
 import tempfile
 import json
+import codecs
+import mmap
 import shutil
+import shlex
+import signal
 import psutil
-import requests
 import socket
 import platform
 import time
 import threading
-from pathlib import Path
-from typing import Any, List, Optional, Dict, Union
+import atexit
+import contextlib
+import uuid
+import hashlib
+import multiprocessing
+import importlib.util
+import inspect
+import tarfile
+import zipfile
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, partial
+from itertools import islice
+from typing import Any, Callable, Iterator, List, Optional, Dict, Tuple, Union
 from app.tool import BaseTool
 import logging
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Optional ISA-L backed gzip (SIMD deflate/inflate); falls back to stdlib zlib
+try:
+    from isal import igzip
+except ImportError:
+    igzip = None
+
+# Optional httpx (pulled in by openai) for native async HTTP in WebRequest; falls back to
+# the pooled requests session on the I/O pool. HTTP/2 additionally needs the h2 package.
+# Both HTTP stacks take tens of ms to import, so only availability is checked here and
+# the import happens on the first WebRequest
+HAVE_HTTPX = importlib.util.find_spec('httpx') is not None
+
+# fcntl is POSIX-only; without it FileCopy skips the reflink clone attempt
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Optional RE2 engine (google-re2) for linear-time content search; falls back to stdlib re
+try:
+    import re2
+    re2.Options  # other packages named re2 (pyre2, fb-re2) expose a different API
+except (ImportError, AttributeError):
+    re2 = None
+
 # Enhanced shell session management
 shell_sessions = {}
+_sessions_lock = asyncio.Lock()
+
+# Commands kept per shell session for shell_view; older entries drop off in O(1)
+SHELL_HISTORY_SIZE = 10
+
+# Characters of stdout/stderr kept per history entry (half from the head, half from the tail)
+SHELL_HISTORY_ENTRY_MAX = 64 * 1024
+
+def _clip_history(text: Optional[str]) -> Optional[str]:
+    if text is None or len(text) <= SHELL_HISTORY_ENTRY_MAX:
+        return text
+    half = SHELL_HISTORY_ENTRY_MAX // 2
+    return f"{text[:half]}\n... [{len(text) - 2 * half} characters truncated] ...\n{text[-half:]}"
+
+# Larger than io.DEFAULT_BUFFER_SIZE (8 KiB) to cut read() syscalls on big files
+READ_BUFFER_SIZE = 128 * 1024
+
+# Files up to this size are read with one os.read() rather than memory-mapped
+SMALL_READ_MAX = 64 * 1024
+
+# Threads in the shared I/O pool (parallel tree copies, HTTP requests)
+IO_WORKERS = 8
+
+# Ranged reads ending within this many lines stream from the top instead of building an index
+LINE_STREAM_MAX = 10000
+
+# Bytes scanned per numpy pass when building a file's newline index
+LINE_INDEX_TILE = 64 * 1024 * 1024
+
+# Total size of cached line indexes (8 bytes per line); an index larger than this is rebuilt per read
+LINE_INDEX_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Chunk size used when streaming file data into archives
+ARCHIVE_COPY_BUFSIZE = 1024 * 1024
+
+# zlib level for zip/tar.gz members: level 3 is several times faster than the default 6
+# for a few percent larger output
+ARCHIVE_COMPRESS_LEVEL = 3
+
+# Extensions whose contents are already compressed; zip stores them instead of deflating again
+_INCOMPRESSIBLE = frozenset({
+    '.zip', '.gz', '.tgz', '.bz2', '.xz', '.zst', '.7z', '.rar',
+    '.jpg', '.jpeg', '.png', '.gif', '.webp', '.mp3', '.mp4', '.mkv', '.mov', '.webm', '.pdf',
+})
+
+# Shared runtime resources: created lazily on first use and reused by every tool
+_io_pool: Optional[ThreadPoolExecutor] = None
+_cpu_pool: Optional[ProcessPoolExecutor] = None
+_http_session: Optional["requests.Session"] = None
+_http_client: Optional["httpx.AsyncClient"] = None
+_http_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def _get_io_pool() -> ThreadPoolExecutor:
+    """Threads for blocking file and network I/O."""
+    global _io_pool
+    if _io_pool is None:
+        _io_pool = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="manus-io")
+        atexit.register(_io_pool.shutdown, wait=False, cancel_futures=True)
+    return _io_pool
+
+async def _run_io(func: Callable, *args: Any) -> Any:
+    """Run a blocking filesystem call on the shared I/O pool."""
+    return await asyncio.get_running_loop().run_in_executor(_get_io_pool(), func, *args)
+
+def _get_cpu_pool() -> ProcessPoolExecutor:
+    """Long-lived worker processes for CPU-bound archive work."""
+    global _cpu_pool
+    if _cpu_pool is None:
+        try:
+            workers = len(os.sched_getaffinity(0))
+        except AttributeError:
+            workers = os.cpu_count() or 1
+        # Workers start lazily while the I/O threads and event loop are running; forking then
+        # could copy a held lock into the child, so start them from a clean process instead
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        _cpu_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method))
+        atexit.register(_cpu_pool.shutdown, wait=False, cancel_futures=True)
+    return _cpu_pool
+
+def _get_http_session() -> "requests.Session":
+    """Process-wide session so repeated requests reuse pooled keep-alive connections."""
+    global _http_session
+    if _http_session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        _http_session = requests.Session()
+        # Same keep-alive budget as the httpx client; no retries, so failures surface immediately
+        adapter = HTTPAdapter(pool_connections=HTTP_KEEPALIVE_CONNECTIONS, pool_maxsize=HTTP_KEEPALIVE_CONNECTIONS, max_retries=0)
+        _http_session.mount('http://', adapter)
+        _http_session.mount('https://', adapter)
+        atexit.register(_http_session.close)
+    return _http_session
+
+# Keep-alive connections the async HTTP client holds open across WebRequest calls
+HTTP_KEEPALIVE_CONNECTIONS = 32
+
+def _get_http_client() -> "httpx.AsyncClient":
+    """Shared async client; its pooled connections belong to one event loop, so a new loop gets a new client."""
+    global _http_client, _http_client_loop
+    loop = asyncio.get_running_loop()
+    if _http_client is None or _http_client_loop is not loop:
+        import httpx
+        if _http_client is None:
+            atexit.register(_close_http_client_at_exit)
+        else:
+            _discard_http_client(_http_client, _http_client_loop, loop)
+        try:
+            import h2  # noqa: F401
+            http2 = True
+        except ImportError:
+            http2 = False
+        _http_client = httpx.AsyncClient(
+            http2=http2,
+            follow_redirects=True,
+            limits=httpx.Limits(max_keepalive_connections=HTTP_KEEPALIVE_CONNECTIONS),
+        )
+        _http_client_loop = loop
+    return _http_client
+
+async def _aclose_quietly(client: "httpx.AsyncClient") -> None:
+    # Connections opened on a loop that has since closed can fail to shut down cleanly
+    with contextlib.suppress(Exception):
+        await client.aclose()
+
+def _discard_http_client(client: "httpx.AsyncClient", client_loop: asyncio.AbstractEventLoop,
+                         loop: asyncio.AbstractEventLoop) -> None:
+    """Close a client being replaced, on its own loop while that loop is still running."""
+    if client_loop.is_running():
+        asyncio.run_coroutine_threadsafe(_aclose_quietly(client), client_loop)
+    else:
+        loop.create_task(_aclose_quietly(client))
+
+async def _close_http_client() -> None:
+    """Close the shared async HTTP client; the next WebRequest opens a fresh one."""
+    global _http_client, _http_client_loop
+    client, _http_client, _http_client_loop = _http_client, None, None
+    if client is not None:
+        await _aclose_quietly(client)
+
+def _close_http_client_at_exit() -> None:
+    if _http_client is not None and not (_http_client_loop and _http_client_loop.is_running()):
+        asyncio.run(_close_http_client())
+
+# Per-stream cap on subprocess output kept in memory for display/history
+MAX_CAPTURED_OUTPUT = 1024 * 1024
+
+def _decode_output(data: Optional[bytes]) -> Optional[str]:
+    return data.decode('utf-8', 'replace') if data is not None else None
+
+async def _read_capped(stream: Optional[asyncio.StreamReader], limit: Optional[int]) -> Optional[bytes]:
+    """Drain stream to EOF, keeping at most limit bytes so the child never blocks on a full pipe."""
+    if stream is None:
+        return None
+    if limit is None:
+        return await stream.read()
+    chunks = []
+    kept = total = 0
+    while chunk := await stream.read(READ_BUFFER_SIZE):
+        total += len(chunk)
+        if kept < limit:
+            chunks.append(chunk[:limit - kept])
+            kept += len(chunks[-1])
+    if total > kept:
+        chunks.append(f"\n... [{total - kept} bytes truncated]".encode())
+    return b"".join(chunks)
+
+async def _feed_input(stream: Optional[asyncio.StreamWriter], data: Optional[bytes]) -> None:
+    if stream is None:
+        return
+    try:
+        if data:
+            stream.write(data)
+            await stream.drain()
+    except (BrokenPipeError, ConnectionResetError):
+        # The child exited without reading everything; its status tells the story
+        pass
+    finally:
+        stream.close()
+
+async def _collect_output(process: asyncio.subprocess.Process, max_output: Optional[int] = None, input: Optional[bytes] = None) -> Tuple[Optional[bytes], Optional[bytes]]:
+    _, stdout, stderr = await asyncio.gather(
+        _feed_input(process.stdin, input),
+        _read_capped(process.stdout, max_output),
+        _read_capped(process.stderr, max_output),
+    )
+    await process.wait()
+    return stdout, stderr
+
+async def _run_exec(cmd: List[str], *, timeout: float, cwd: Optional[str] = None, capture_output: bool = True, max_output: Optional[int] = None, input: Optional[bytes] = None, discard_stdout: bool = False) -> subprocess.CompletedProcess:
+    """Async counterpart of subprocess.run that leaves the event loop free while the child runs."""
+    pipe = asyncio.subprocess.PIPE if capture_output else None
+    stdin = asyncio.subprocess.PIPE if input is not None else None
+    stdout = asyncio.subprocess.DEVNULL if discard_stdout else pipe
+    # An absolute executable and close_fds=False let CPython launch via posix_spawn
+    # (when no cwd is set); our own fds are already non-inheritable per PEP 446.
+    executable = shutil.which(cmd[0]) or cmd[0]
+    process = await asyncio.create_subprocess_exec(
+        executable, *cmd[1:], cwd=cwd, stdin=stdin, stdout=stdout, stderr=pipe, close_fds=False
+    )
+    return await _communicate(process, cmd, timeout, max_output, input)
+
+async def _communicate(process: asyncio.subprocess.Process, cmd: Union[str, List[str]], timeout: float, max_output: Optional[int] = None, input: Optional[bytes] = None) -> subprocess.CompletedProcess:
+    try:
+        stdout, stderr = await asyncio.wait_for(_collect_output(process, max_output, input), timeout=timeout)
+    except asyncio.TimeoutError:
+        try:
+            process.kill()
+        except ProcessLookupError:
+            pass
+        await process.wait()
+        raise subprocess.TimeoutExpired(cmd, timeout)
+    return subprocess.CompletedProcess(cmd, process.returncode, _decode_output(stdout), _decode_output(stderr))
+
+async def _read_until(stream: asyncio.StreamReader, marker: bytes, limit: Optional[int]) -> Tuple[bytes, bytes, bool]:
+    """Read stream up to marker, keeping at most limit bytes; returns (output, rest, found)."""
+    chunks = []
+    kept = total = 0
+    pending = b""
+    found = False
+    rest = b""
+    while True:
+        chunk = await stream.read(READ_BUFFER_SIZE)
+        if not chunk:
+            data = pending
+        else:
+            data = pending + chunk
+            idx = data.find(marker)
+            if idx >= 0:
+                found = True
+                rest = data[idx + len(marker):]
+                data = data[:idx]
+            else:
+                # Hold back a marker-sized tail in case the marker straddles two reads
+                split = max(len(data) - len(marker) + 1, 0)
+                data, pending = data[:split], data[split:]
+        total += len(data)
+        if limit is None or kept < limit:
+            chunks.append(data if limit is None else data[:limit - kept])
+            kept += len(chunks[-1])
+        if found or not chunk:
+            break
+    if total > kept:
+        chunks.append(f"\n... [{total - kept} bytes truncated]".encode())
+    return b"".join(chunks), rest, found
+
+class _PersistentShell:
+    """Long-lived bash coprocess for a shell session; commands are piped in and delimited by a sentinel.
+
+    Not safe for concurrent run() calls; ShellExec serialises them with the session lock.
+    """
+
+    def __init__(self):
+        self.process: Optional[asyncio.subprocess.Process] = None
+
+    async def _start(self) -> asyncio.subprocess.Process:
+        if self.process is None or self.process.returncode is not None:
+            self.process = await asyncio.create_subprocess_exec(
+                shutil.which("bash") or "/bin/sh",
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                close_fds=False,
+                start_new_session=True,
+            )
+        return self.process
+
+    async def run(self, command: str, *, timeout: float, cwd: str, max_output: Optional[int] = None) -> subprocess.CompletedProcess:
+        process = await self._start()
+        marker = f"__DONE_{uuid.uuid4().hex}__"
+        # eval keeps syntax errors from killing the shell; stdin is the command pipe,
+        # so the command itself reads from /dev/null
+        script = (
+            f"cd -- {shlex.quote(cwd)} && eval {shlex.quote(command)} < /dev/null\n"
+            f"printf '\\n%s %d\\n' {marker} \"$?\"; printf '\\n%s\\n' {marker} >&2\n"
+        )
+        stdout_marker = f"\n{marker} ".encode()
+        stderr_marker = f"\n{marker}\n".encode()
+        try:
+            process.stdin.write(script.encode())
+            await process.stdin.drain()
+            (stdout, rest, found), (stderr, _, _) = await asyncio.wait_for(
+                asyncio.gather(
+                    _read_until(process.stdout, stdout_marker, max_output),
+                    _read_until(process.stderr, stderr_marker, max_output),
+                ),
+                timeout=timeout,
+            )
+            while found and b"\n" not in rest:
+                chunk = await asyncio.wait_for(process.stdout.read(64), timeout=timeout)
+                if not chunk:
+                    break
+                rest += chunk
+            if found and b"\n" in rest:
+                returncode = int(rest.split(b"\n", 1)[0])
+            elif found:
+                # The shell died while printing the status line; use it if it arrived whole
+                status = rest.strip()
+                returncode = int(status) if status.lstrip(b"-").isdigit() else await process.wait()
+                self.process = None
+            else:
+                # The command exited the shell itself; start a fresh one next time
+                returncode = await process.wait()
+                self.process = None
+        except asyncio.TimeoutError:
+            self.close()
+            raise subprocess.TimeoutExpired(command, timeout)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close()
+            raise
+        return subprocess.CompletedProcess(command, returncode, _decode_output(stdout), _decode_output(stderr))
+
+    def close(self) -> None:
+        if self.process is not None and self.process.returncode is None:
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        self.process = None
+
+def _write_fd(file: str, data: Union[bytes, List[bytes]], append: bool = False, fsync: bool = False) -> None:
+    """Write already-encoded bytes straight to a raw fd, bypassing TextIOWrapper.
+
+    data may be a list of buffers, which go out with one writev() instead of
+    being concatenated first.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | (os.O_APPEND if append else os.O_TRUNC)
+    fd = os.open(file, flags, 0o644)
+    try:
+        views = [memoryview(chunk) for chunk in ([data] if isinstance(data, bytes) else data) if chunk]
+        while views:
+            written = os.writev(fd, views)
+            # Drop fully written buffers and trim a partially written one
+            while views and written >= len(views[0]):
+                written -= len(views.pop(0))
+            if written:
+                views[0] = views[0][written:]
+        if fsync:
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def _atomic_write(file: str, data: Union[bytes, List[bytes]]) -> None:
+    """Replace file with data so readers never observe a partially written file."""
+    # Replace a symlink's target rather than the link itself
+    real = os.path.realpath(file)
+    # A unique temp name per call: concurrent writes to one path each get their own file
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(real) or '.', prefix=f".{os.path.basename(real)}.")
+    os.close(fd)
+    try:
+        _write_fd(tmp, data, fsync=True)
+        if os.path.exists(real):
+            shutil.copymode(real, tmp)
+        else:
+            # mkstemp creates 0600; give new files the mode _write_fd would have
+            os.chmod(tmp, 0o644)
+        os.replace(tmp, real)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+def _replace_in_file(file: str, needle: bytes, replacement: bytes) -> bool:
+    """Replace every occurrence of needle in file, returning False if it is absent.
+
+    The presence check scans an mmap of the file, so misses cost no extra
+    allocation; hits are written to a sibling temp file and renamed into place.
+    """
+    with open(file, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return needle == b''
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            crlf = (b'\n' in needle or b'\r' in needle) and mm.find(b'\r') != -1
+            if not crlf:
+                if mm.find(needle) < 0:
+                    return False
+                data = mm[:]
+    if crlf:
+        # A multi-line needle must match CRLF/CR line ends the way a text-mode read sees them
+        content = _read_text(file, 'utf-8')
+        old = needle.decode('utf-8')
+        if old not in content:
+            return False
+        _atomic_write(file, content.replace(old, replacement.decode('utf-8')).encode('utf-8'))
+        return True
+    _atomic_write(file, data.replace(needle, replacement))
+    return True
+
+# Literal replace-all for root-owned files: argv is (old, new, file); exits 3 when old is absent
+_PERL_REPLACE_LITERAL = (
+    'my ($old, $new, $f) = @ARGV; '
+    'open my $fh, "+<", $f or die "$f: $!\\n"; '
+    'my $s = do { local $/; <$fh> }; '
+    'my $n = $s =~ s/\\Q$old\\E/$new/g; '
+    'exit 3 unless $n; '
+    'seek $fh, 0, 0; print $fh $s; truncate $fh, tell $fh; '
+    'close $fh or die "$f: $!\\n";'
+)
+
+_line_index_cache: "OrderedDict[Tuple[str, int, int, int], array]" = OrderedDict()
+_line_index_cache_bytes = 0
+_line_index_lock = threading.Lock()
+
+def _line_index(file: str, ino: int, mtime_ns: int, size: int) -> array:
+    """Byte offset of every line start in file, plus a trailing end-of-file sentinel.
+
+    Keyed on (inode, mtime, size) so paging through a log reuses one index until the file changes.
+    """
+    global _line_index_cache_bytes
+    key = (os.path.abspath(file), ino, mtime_ns, size)
+    with _line_index_lock:
+        offsets = _line_index_cache.get(key)
+        if offsets is not None:
+            _line_index_cache.move_to_end(key)
+            return offsets
+    offsets = _build_line_index(file, size)
+    nbytes = len(offsets) * offsets.itemsize
+    if nbytes <= LINE_INDEX_CACHE_MAX_BYTES:
+        with _line_index_lock:
+            if key not in _line_index_cache:
+                _line_index_cache[key] = offsets
+                _line_index_cache_bytes += nbytes
+                while _line_index_cache_bytes > LINE_INDEX_CACHE_MAX_BYTES:
+                    _, evicted = _line_index_cache.popitem(last=False)
+                    _line_index_cache_bytes -= len(evicted) * evicted.itemsize
+    return offsets
+
+def _build_line_index(file: str, size: int) -> array:
+    import numpy as np
+    offsets = array('q', [0])
+    if size:
+        with open(file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Vectorised byte compare per tile; tiling bounds the temporary mask
+            # to LINE_INDEX_TILE bytes however large the file is
+            for base in range(0, size, LINE_INDEX_TILE):
+                tile = np.frombuffer(mm, dtype=np.uint8, count=min(LINE_INDEX_TILE, size - base), offset=base)
+                starts = np.flatnonzero(tile == 0x0A).astype(np.int64)
+                starts += base + 1
+                offsets.frombytes(starts.tobytes())
+                del tile, starts
+        if offsets[-1] != size:
+            offsets.append(size)
+    return offsets
+
+def _read_text(file: str, encoding: str) -> str:
+    """Decode a whole file straight from its mmap, skipping the buffered text-layer copy.
+
+    Small files take a single os.read() instead, which is cheaper than setting up a mapping.
+    """
+    fd = os.open(file, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        if 0 < size <= SMALL_READ_MAX:
+            text = os.read(fd, size).decode(encoding)
+        elif size:
+            with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+                text = str(mm, encoding)
+        else:
+            # Zero-length or pseudo files (e.g. /proc) can't be mapped
+            with open(fd, 'rb', buffering=READ_BUFFER_SIZE, closefd=False) as f:
+                text = f.read().decode(encoding)
+    finally:
+        os.close(fd)
+    return _universal_newlines(text)
+
+def _universal_newlines(text: str) -> str:
+    """Match text-mode newline translation for text decoded from bytes."""
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+@lru_cache(maxsize=32)
+def _ascii_newlines(encoding: str) -> bool:
+    """Whether encoding writes CR/LF as the single ASCII bytes, so raw b'\\n' splits land on line ends."""
+    return '\r\n'.encode(encoding) == b'\r\n'
+
+# Recently read small files, keyed on (path, encoding, inode, mtime_ns, size) so a rewrite misses
+READ_CACHE_MAX_BYTES = 64 * 1024 * 1024
+READ_CACHE_MAX_FILE = 4 * 1024 * 1024
+_read_cache: "OrderedDict[Tuple[str, str, int, int, int], str]" = OrderedDict()
+_read_cache_bytes = 0
+_read_cache_lock = threading.Lock()
+
+def _read_text_cached(file: str, encoding: str) -> str:
+    """_read_text behind a byte-bounded LRU; large files bypass it."""
+    global _read_cache_bytes
+    stat = os.stat(file)
+    if stat.st_size > READ_CACHE_MAX_FILE or stat.st_size == 0:
+        return _read_text(file, encoding)
+    # The inode changes on every atomic rewrite, even one landing within the same mtime tick
+    key = (os.path.abspath(file), encoding, stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    with _read_cache_lock:
+        text = _read_cache.get(key)
+        if text is not None:
+            _read_cache.move_to_end(key)
+            return text
+    text = _read_text(file, encoding)
+    with _read_cache_lock:
+        if key not in _read_cache:
+            _read_cache[key] = text
+            _read_cache_bytes += len(text)
+            while _read_cache_bytes > READ_CACHE_MAX_BYTES:
+                _, evicted = _read_cache.popitem(last=False)
+                _read_cache_bytes -= len(evicted)
+    return text
+
+def _read_line_range(file: str, start: int, end_line: Optional[int], encoding: str) -> Tuple[str, int]:
+    """Read lines [start, end_line) using the cached line index; returns (content, end)."""
+    if not _ascii_newlines(encoding):
+        # utf-16/32 and BOM-prefixed encodings can't be split as bytes; stream decoded lines
+        with open(file, 'r', encoding=encoding, buffering=READ_BUFFER_SIZE) as f:
+            lines = list(islice(f, start, end_line))
+        content = ''.join(lines)
+        if content.endswith('\n'):
+            content = content[:-1]
+        return content, end_line or start + len(lines)
+    if end_line and end_line <= LINE_STREAM_MAX:
+        # Near the top of the file: stream just the lines needed rather than indexing it all
+        with open(file, 'rb', buffering=READ_BUFFER_SIZE) as f:
+            content = _universal_newlines(b"".join(islice(f, start, end_line)).decode(encoding))
+        if content.endswith('\n'):
+            content = content[:-1]
+        return content, end_line
+    stat = os.stat(file)
+    offsets = _line_index(file, stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    total = len(offsets) - 1
+    first = min(start, total)
+    last = max(first, min(end_line or total, total))
+    with open(file, 'rb') as f:
+        f.seek(offsets[first])
+        content = _universal_newlines(f.read(offsets[last] - offsets[first]).decode(encoding))
+    if content.endswith('\n'):
+        content = content[:-1]
+    return content, end_line or start + (last - first)
+
+# ioctl(2) request that makes the destination share the source's extents (linux/fs.h)
+FICLONE = 0x40049409
+
+def _copy_file(source: str, destination: str, preserve_attributes: bool = True, reflink: bool = True) -> str:
+    """shutil.copy/copy2 equivalent that copies data in-kernel with copy_file_range.
+
+    With reflink, a FICLONE ioctl is tried first so Btrfs/XFS clone the file
+    copy-on-write in O(1); copy_file_range then avoids the userspace bounce
+    buffer elsewhere. Falls back to shutil when neither works for the pair.
+    """
+    if os.path.isdir(destination):
+        destination = os.path.join(destination, os.path.basename(source))
+    if os.path.exists(destination) and os.path.samefile(source, destination):
+        raise shutil.SameFileError(f"{source!r} and {destination!r} are the same file")
+    copied = False
+    if hasattr(os, 'copy_file_range'):
+        with open(source, 'rb') as src:
+            remaining = os.fstat(src.fileno()).st_size
+            # Zero-sized pseudo files report no length; let shutil stream them
+            if remaining:
+                with open(destination, 'wb') as dst:
+                    if reflink and fcntl is not None:
+                        try:
+                            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+                            remaining = 0
+                            copied = True
+                        except OSError:
+                            # EOPNOTSUPP/EXDEV/EINVAL: no shared-extent support for this pair
+                            pass
+                    try:
+                        while remaining > 0:
+                            sent = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                            if sent == 0:
+                                break
+                            remaining -= sent
+                        copied = True
+                    except OSError:
+                        # e.g. EXDEV on older kernels or EINVAL on special files
+                        src.seek(0)
+                        dst.seek(0)
+                        dst.truncate()
+    if not copied:
+        shutil.copyfile(source, destination)
+    if preserve_attributes:
+        shutil.copystat(source, destination)
+    else:
+        shutil.copymode(source, destination)
+    return destination
+
+def _copy_tree_parallel(source: str, destination: str, reflink: bool = True) -> None:
+    """Copy a directory tree like shutil.copytree, overlapping per-file syscalls across threads."""
+    executor = _get_io_pool()
+    futures = []
+    for dirpath, _, filenames in os.walk(source, followlinks=True):
+        target_dir = os.path.join(destination, os.path.relpath(dirpath, source))
+        os.makedirs(target_dir, exist_ok=True)
+        for filename in filenames:
+            futures.append(executor.submit(
+                _copy_file, os.path.join(dirpath, filename), os.path.join(target_dir, filename), True, reflink
+            ))
+    for future in futures:
+        future.result()
+
+def _unlink_all(paths: List[str]) -> None:
+    for path in paths:
+        os.unlink(path)
+
+def _split_entries(path: str) -> Tuple[List[str], List[str]]:
+    """(subdirectories, other entries) directly under path, without following symlinks."""
+    if os.path.islink(path):
+        raise OSError("Cannot call rmtree on a symbolic link")
+    subdirs, files = [], []
+    with os.scandir(path) as it:
+        for entry in it:
+            (subdirs if entry.is_dir(follow_symlinks=False) else files).append(entry.path)
+    return subdirs, files
+
+async def _remove_tree_parallel(path: str) -> None:
+    """shutil.rmtree with each top-level subdirectory removed on its own I/O pool thread."""
+    subdirs, files = await _run_io(_split_entries, path)
+    loop = asyncio.get_running_loop()
+    executor = _get_io_pool()
+    await asyncio.gather(
+        loop.run_in_executor(executor, _unlink_all, files),
+        *(loop.run_in_executor(executor, shutil.rmtree, subdir) for subdir in subdirs),
+    )
+    await _run_io(os.rmdir, path)
+
+@lru_cache(maxsize=256)
+def _compile_pattern(pattern: str, flags: int = 0) -> re.Pattern:
+    """re.compile memoized on (pattern, flags) so repeated searches skip compilation."""
+    return re.compile(pattern, flags)
+
+@lru_cache(maxsize=256)
+def _compile_search_pattern(pattern: str, flags: int = 0) -> re.Pattern:
+    """Like _compile_pattern, but prefers RE2 (linear time, immune to catastrophic backtracking).
+
+    Patterns RE2 rejects (backreferences, lookaround, ...) fall back to the stdlib engine.
+    """
+    if re2 is not None:
+        options = re2.Options()
+        options.log_errors = False
+        options.case_sensitive = not flags & re.IGNORECASE
+        try:
+            return re2.compile(pattern, options)
+        except re2.error:
+            pass
+    return re.compile(pattern, flags)
+
+_REGEX_METACHARS = frozenset('.^$*+?{}[]\\|()')
+
+def _is_literal_pattern(regex: str) -> bool:
+    """Whether regex matches only itself, so a plain substring search is equivalent."""
+    return bool(regex) and not _REGEX_METACHARS.intersection(regex)
+
+# Dependency, cache and build directories that recursive name searches don't descend into;
+# they routinely hold 100k+ entries, so pruning them removes most of the getdents64 calls
+DEFAULT_SKIP_DIRS = frozenset({
+    '.git', 'node_modules', '__pycache__', '.venv', '.mypy_cache', '.pytest_cache', 'dist', 'build',
+})
+
+def _iter_by_name(path: str, name_glob: str, recursive: bool, include_hidden: bool,
+                  skip_dirs: frozenset = DEFAULT_SKIP_DIRS) -> Iterator[str]:
+    """Match entry names with fnmatch over os.scandir/os.walk, using the d_type readdir already returned.
+
+    Like Path.glob/rglob, hidden directories are still searched; include_hidden only
+    decides whether entries whose own name starts with '.' are reported.
+    """
+    if os.sep in name_glob or '**' in name_glob:
+        # Path-style patterns need segment-by-segment matching; iglob does it lazily on plain strings.
+        # It can't prune, so matches reached through skipped directories are filtered out afterwards.
+        # Only '**' expansion descends on its own; directories the pattern names are always searched
+        root = glob.escape(path)
+        pattern = os.path.join(root, '**', name_glob) if recursive else os.path.join(root, name_glob)
+        if recursive or '**' in name_glob:
+            skip_dirs = skip_dirs.difference(name_glob.split(os.sep))
+        else:
+            skip_dirs = frozenset()
+        for match in glob.iglob(pattern, recursive=True, include_hidden=True):
+            if not include_hidden and os.path.basename(match).startswith('.'):
+                continue
+            if skip_dirs and not skip_dirs.isdisjoint(os.path.relpath(os.path.dirname(match), path).split(os.sep)):
+                continue
+            yield match
+        return
+    if not recursive:
+        with os.scandir(path) as it:
+            for entry in it:
+                if (include_hidden or not entry.name.startswith('.')) and fnmatch.fnmatchcase(entry.name, name_glob):
+                    yield entry.path
+        return
+    for dirpath, dirnames, filenames in os.walk(path):
+        for name in fnmatch.filter(dirnames, name_glob) + fnmatch.filter(filenames, name_glob):
+            if include_hidden or not name.startswith('.'):
+                yield os.path.join(dirpath, name)
+        # Prune after matching so a skipped directory can itself still be found by name
+        dirnames[:] = [d for d in dirnames if d not in skip_dirs]
+
+# Results handed to a streaming writer per batch; also how often a scan yields to the event loop
+STREAM_BATCH = 100
+
+async def _collect_streamed(iterator: Iterator[str], limit: Optional[int] = None, writer: Optional[Callable[[str], Any]] = None) -> List[str]:
+    """Drain iterator on the I/O pool, stopping after limit items.
+
+    With a writer, items are pulled STREAM_BATCH at a time and each batch is passed to
+    writer (newline-joined) as soon as it is found, so callers can render results before
+    the scan ends and a cancelled caller keeps what it already received.
+    """
+    loop = asyncio.get_running_loop()
+    executor = _get_io_pool()
+    results = []
+    while limit is None or len(results) < limit:
+        remaining = None if limit is None else limit - len(results)
+        size = remaining if writer is None else min(STREAM_BATCH, remaining or STREAM_BATCH)
+        batch = await loop.run_in_executor(executor, list, islice(iterator, size))
+        results.extend(batch)
+        if batch and writer is not None:
+            written = writer("\n".join(batch))
+            if inspect.isawaitable(written):
+                await written
+        if size is None or len(batch) < size:
+            break
+    return results
+
+def _iter_regex_lines(content: str, pattern: re.Pattern) -> Iterator[str]:
+    """Report the line of every match, counting newlines incrementally between hits."""
+    line_num = 1
+    line_start = 0
+    for match in pattern.finditer(content):
+        pos = match.start()
+        hit_line_start = content.rfind('\n', 0, pos) + 1
+        line_num += content.count('\n', line_start, hit_line_start)
+        line_start = hit_line_start
+        line_end = content.find('\n', pos)
+        if line_end == -1:
+            line_end = len(content)
+        yield f"Line {line_num}: {content[line_start:line_end].strip()}"
+
+# Constructs that can match across a newline or anchor to the whole file (literal or escaped
+# newlines, \s, \W, \D, numeric/unicode escapes, negated classes, inline DOTALL, ^/$/\A/\Z);
+# such patterns must see all of it
+_CROSS_LINE_HINT = re.compile(r"\\[nrsWDxuUNAZ0-7]|\[\^|\(\?[aiLmux]*s|[\^$\n\r]")
+
+def _scan_regex_lines(file: str, pattern: re.Pattern) -> Iterator[str]:
+    """Line-by-line streaming search: O(line) memory and reads no further than the consumer pulls."""
+    with open(file, 'r', encoding='utf-8', buffering=READ_BUFFER_SIZE) as f:
+        for line_num, line in enumerate(f, 1):
+            for _ in pattern.finditer(line):
+                yield f"Line {line_num}: {line.strip()}"
+
+_BARE_CR = re.compile(rb'\r(?!\n)')
+
+def _iter_literal_lines(file: str, needle: bytes) -> Iterator[str]:
+    """Report the line of every occurrence of needle using mmap.find (memmem)."""
+    with open(file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        # Lines are split on b'\n' alone, which only matches text mode if no line ends in a bare CR
+        if mm.find(b'\r') == -1 or not _BARE_CR.search(mm):
+            line_num = 1
+            line_start = 0
+            pos = mm.find(needle)
+            while pos != -1:
+                hit_line_start = mm.rfind(b'\n', 0, pos) + 1
+                line_num += mm[line_start:hit_line_start].count(b'\n')
+                line_start = hit_line_start
+                line_end = mm.find(b'\n', pos)
+                if line_end == -1:
+                    line_end = len(mm)
+                line_content = mm[line_start:line_end].decode('utf-8', 'replace')
+                yield f"Line {line_num}: {line_content.strip()}"
+                pos = mm.find(needle, pos + (len(needle) or 1))
+            return
+    # CR-only line ends: let text mode's universal newlines split the lines
+    yield from _scan_regex_lines(file, re.compile(re.escape(needle.decode('utf-8'))))
 
 class MessageNotifyUser(BaseTool):
     name: str = "message_notify_user"
@@ -58,12 +867,11 @@ class MessageNotifyUser(BaseTool):
             "error": "❌"
         }
         icon = icons.get(message_type, "📢")
-        result = f"{icon} **{message_type.title()}**: {text}"
+        parts = [f"{icon} **{message_type.title()}**: {text}"]
         if attachments:
-            result += f"\n\n📎 **Attachments**:\n"
-            for attachment in attachments:
-                result += f"- {attachment}\n"
-        return result
+            parts.append("\n\n📎 **Attachments**:\n")
+            parts.extend(f"- {attachment}\n" for attachment in attachments)
+        return "".join(parts)
 
 class MessageAskUser(BaseTool):
     name: str = "message_ask_user"
@@ -97,18 +905,16 @@ class MessageAskUser(BaseTool):
     }
 
     async def execute(self, *, text: str, attachments: Optional[List[str]] = None, suggest_user_takeover: str = "none", options: Optional[List[str]] = None, **kwargs: Any) -> str:
-        result = f"❓ **Question**: {text}"
+        parts = [f"❓ **Question**: {text}"]
         if attachments:
-            result += f"\n\n📎 **Reference Materials**:\n"
-            for attachment in attachments:
-                result += f"- {attachment}\n"
+            parts.append("\n\n📎 **Reference Materials**:\n")
+            parts.extend(f"- {attachment}\n" for attachment in attachments)
         if options:
-            result += f"\n\n💡 **Suggested Options**:\n"
-            for i, option in enumerate(options, 1):
-                result += f"{i}. {option}\n"
+            parts.append("\n\n💡 **Suggested Options**:\n")
+            parts.extend(f"{i}. {option}\n" for i, option in enumerate(options, 1))
         if suggest_user_takeover != "none":
-            result += f"\n💡 **Suggestion**: Consider {suggest_user_takeover} takeover for this task."
-        return result
+            parts.append(f"\n💡 **Suggestion**: Consider {suggest_user_takeover} takeover for this task.")
+        return "".join(parts)
 
 class FileRead(BaseTool):
     name: str = "file_read"
@@ -142,23 +948,30 @@ class FileRead(BaseTool):
 
     async def execute(self, *, file: str, start_line: Optional[int] = None, end_line: Optional[int] = None, sudo: bool = False, encoding: str = "utf-8", **kwargs: Any) -> str:
         try:
+            ranged = start_line is not None or end_line is not None
+            start = start_line or 0
+            
             if sudo:
                 cmd = ["sudo", "cat", file]
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+                result = await _run_exec(cmd, timeout=30)
                 if result.returncode != 0:
                     return f"❌ Error reading file '{file}': {result.stderr}"
                 content = result.stdout
+                if ranged:
+                    lines = content.split('\n')
+                    end = end_line or len(lines)
+                    content = '\n'.join(lines[start:end])
             else:
-                with open(file, 'r', encoding=encoding) as f:
-                    content = f.read()
-            
-            lines = content.split('\n')
+                # Disk reads run on the shared I/O pool so the event loop keeps serving other tools
+                loop = asyncio.get_running_loop()
+                if ranged:
+                    content, end = await loop.run_in_executor(
+                        _get_io_pool(), _read_line_range, file, start, end_line, encoding
+                    )
+                else:
+                    content = await loop.run_in_executor(_get_io_pool(), _read_text_cached, file, encoding)
             
-            if start_line is not None or end_line is not None:
-                start = start_line or 0
-                end = end_line or len(lines)
-                lines = lines[start:end]
-                content = '\n'.join(lines)
+            if ranged:
                 result = f"📖 **File Content** (lines {start}-{end}):\n```\n{content}\n```"
             else:
                 result = f"📖 **File Content**:\n```\n{content}\n```"
@@ -212,30 +1025,29 @@ class FileWrite(BaseTool):
 
     async def execute(self, *, file: str, content: str, append: bool = False, leading_newline: bool = False, trailing_newline: bool = False, sudo: bool = False, encoding: str = "utf-8", **kwargs: Any) -> str:
         try:
-            if leading_newline:
-                content = '\n' + content
+            # Encode the pieces separately (one encoder, so any BOM is emitted once)
+            # and hand them to writev instead of building '\n' + content + '\n'
+            encoder = codecs.getincrementalencoder(encoding)()
+            parts = [encoder.encode('\n')] if leading_newline else []
+            parts.append(encoder.encode(content))
             if trailing_newline:
-                content = content + '\n'
+                parts.append(encoder.encode('\n'))
             
             if sudo:
-                # Create temporary file
-                with tempfile.NamedTemporaryFile(mode='w', delete=False, encoding=encoding) as temp_file:
-                    temp_file.write(content)
-                    temp_file_path = temp_file.name
-                
-                # Copy to destination with sudo
-                cmd = ["sudo", "cp", temp_file_path, file]
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-                
-                # Clean up temp file
-                os.unlink(temp_file_path)
+                # Stream the content to a privileged tee; no temp file round trip
+                cmd = ["sudo", "tee", "-a", file] if append else ["sudo", "tee", file]
+                result = await _run_exec(cmd, timeout=30, input=b"".join(parts), discard_stdout=True)
                 
                 if result.returncode != 0:
                     return f"❌ Error writing file '{file}': {result.stderr}"
+            elif append:
+                await asyncio.get_running_loop().run_in_executor(
+                    _get_io_pool(), partial(_write_fd, file, parts, append=True)
+                )
             else:
-                mode = 'a' if append else 'w'
-                with open(file, mode, encoding=encoding) as f:
-                    f.write(content)
+                await asyncio.get_running_loop().run_in_executor(
+                    _get_io_pool(), _atomic_write, file, parts
+                )
             
             action = "appended to" if append else "written to"
             return f"✅ Content {action} file '{file}'"
@@ -275,43 +1087,51 @@ class FileStrReplace(BaseTool):
 
     async def execute(self, *, file: str, old_str: str, new_str: str, sudo: bool = False, regex: bool = False, **kwargs: Any) -> str:
         try:
+            loop = asyncio.get_running_loop()
+            if not sudo and not regex:
+                replaced = await loop.run_in_executor(
+                    _get_io_pool(), _replace_in_file, file, old_str.encode('utf-8'), new_str.encode('utf-8')
+                )
+                if not replaced:
+                    return f"⚠️ No changes made to file '{file}' (string not found)"
+                return f"✅ String replaced in file '{file}'"
+            
+            if sudo and not regex:
+                # One privileged perl pass: \Q..\E makes old_str literal, argv avoids any shell or
+                # sed quoting, and rewriting through '+<' keeps the file's inode, owner and mode
+                cmd = ["sudo", "perl", "-e", _PERL_REPLACE_LITERAL, old_str, new_str, file]
+                result = await _run_exec(cmd, timeout=30)
+                if result.returncode == 3:
+                    return f"⚠️ No changes made to file '{file}' (string not found)"
+                if result.returncode != 0:
+                    return f"❌ Error modifying file '{file}': {result.stderr}"
+                return f"✅ String replaced in file '{file}'"
+            
             if sudo:
                 cmd = ["sudo", "cat", file]
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+                result = await _run_exec(cmd, timeout=30)
                 if result.returncode != 0:
                     return f"❌ Error reading file '{file}': {result.stderr}"
                 content = result.stdout
             else:
-                with open(file, 'r', encoding='utf-8') as f:
-                    content = f.read()
+                content = await loop.run_in_executor(_get_io_pool(), _read_text, file, 'utf-8')
             
-            if regex:
-                import re
-                new_content = re.sub(old_str, new_str, content)
-            else:
-                new_content = content.replace(old_str, new_str)
+            # Only regex replacements reach this point; literal ones returned above
+            # subn's count says whether anything matched without comparing two file-sized strings
+            new_content, replacements = _compile_pattern(old_str).subn(new_str, content)
             
-            if new_content == content:
+            if not replacements:
                 return f"⚠️ No changes made to file '{file}' (string not found)"
             
             if sudo:
-                # Create temporary file
-                with tempfile.NamedTemporaryFile(mode='w', delete=False) as temp_file:
-                    temp_file.write(new_content)
-                    temp_file_path = temp_file.name
-                
-                # Copy to destination with sudo
-                cmd = ["sudo", "cp", temp_file_path, file]
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-                
-                # Clean up temp file
-                os.unlink(temp_file_path)
+                # Stream the new content to a privileged tee; no temp file round trip
+                cmd = ["sudo", "tee", file]
+                result = await _run_exec(cmd, timeout=30, input=new_content.encode('utf-8'), discard_stdout=True)
                 
                 if result.returncode != 0:
                     return f"❌ Error writing file '{file}': {result.stderr}"
             else:
-                with open(file, 'w', encoding='utf-8') as f:
-                    f.write(new_content)
+                await loop.run_in_executor(_get_io_pool(), _write_fd, file, new_content.encode('utf-8'))
             
             return f"✅ String replaced in file '{file}'"
             
@@ -339,42 +1159,52 @@ class FileFindInContent(BaseTool):
             "case_sensitive": {
                 "type": "boolean",
                 "description": "(Optional) Whether search is case sensitive"
+            },
+            "max_matches": {
+                "type": "integer",
+                "description": "(Optional) Stop searching after this many matches (default: 1000)"
             }
         },
         "required": ["file", "regex"]
     }
 
-    async def execute(self, *, file: str, regex: str, sudo: bool = False, case_sensitive: bool = True, **kwargs: Any) -> str:
+    async def execute(self, *, file: str, regex: str, sudo: bool = False, case_sensitive: bool = True, max_matches: int = 1000, writer: Optional[Callable[[str], Any]] = None, **kwargs: Any) -> str:
+        """Search file for regex; matching lines are also passed to writer in batches as they are found."""
         try:
-            if sudo:
-                cmd = ["sudo", "cat", file]
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-                if result.returncode != 0:
-                    return f"❌ Error reading file '{file}': {result.stderr}"
-                content = result.stdout
-            else:
-                with open(file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-            
-            import re
-            flags = 0 if case_sensitive else re.IGNORECASE
-            pattern = re.compile(regex, flags)
-            matches = pattern.finditer(content)
-            
-            lines = content.split('\n')
-            results = []
-            
-            for match in matches:
-                start_pos = match.start()
-                line_num = content[:start_pos].count('\n') + 1
-                line_content = lines[line_num - 1] if line_num <= len(lines) else "Unknown line"
-                results.append(f"Line {line_num}: {line_content.strip()}")
+            matches = None
+            loop = asyncio.get_running_loop()
+            executor = _get_io_pool()
+            # Size-0 files may still be pseudo-files with content (e.g. /proc) that can't be
+            # mapped or streamed reliably, so they take the full-read path below
+            if not sudo and (await _run_io(os.stat, file)).st_size:
+                if case_sensitive and _is_literal_pattern(regex):
+                    matches = _iter_literal_lines(file, regex.encode('utf-8'))
+                elif not _CROSS_LINE_HINT.search(regex):
+                    pattern = _compile_search_pattern(regex, 0 if case_sensitive else re.IGNORECASE)
+                    matches = _scan_regex_lines(file, pattern)
+            
+            if matches is None:
+                if sudo:
+                    cmd = ["sudo", "cat", file]
+                    result = await _run_exec(cmd, timeout=30)
+                    if result.returncode != 0:
+                        return f"❌ Error reading file '{file}': {result.stderr}"
+                    content = result.stdout
+                else:
+                    content = await loop.run_in_executor(executor, _read_text, file, 'utf-8')
+                
+                flags = 0 if case_sensitive else re.IGNORECASE
+                pattern = _compile_search_pattern(regex, flags)
+                matches = _iter_regex_lines(content, pattern)
             
+            results = await _collect_streamed(matches, max_matches, writer)
             if results:
-                result_text = "\n".join(results[:10])  # Limit to first 10 matches
+                shown = results[:10]  # Limit to first 10 matches
                 if len(results) > 10:
-                    result_text += f"\n... and {len(results) - 10} more matches"
-                return f"🔍 **Found {len(results)} matches** in '{file}':\n```\n{result_text}\n```"
+                    shown.append(f"... and {len(results) - 10} more matches")
+                result_text = "\n".join(shown)
+                found = f"{len(results)}+" if len(results) >= max_matches else len(results)
+                return f"🔍 **Found {found} matches** in '{file}':\n```\n{result_text}\n```"
             else:
                 return f"🔍 No matches found in file '{file}'"
             
@@ -402,37 +1232,112 @@ class FileFindByName(BaseTool):
             "include_hidden": {
                 "type": "boolean",
                 "description": "(Optional) Whether to include hidden files"
+            },
+            "max_results": {
+                "type": "integer",
+                "description": "(Optional) Stop searching after this many matches (default: 1000)"
+            },
+            "skip_dirs": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "(Optional) Directory names not to descend into when searching recursively "
+                               "(default: .git, node_modules, __pycache__, .venv, .mypy_cache, .pytest_cache, dist, build, "
+                               "or none when include_hidden is set; pass an empty list to search everything)"
             }
         },
         "required": ["path", "glob"]
     }
 
-    async def execute(self, *, path: str, glob: str, recursive: bool = False, include_hidden: bool = False, **kwargs: Any) -> str:
+    async def execute(self, *, path: str, glob: str, recursive: bool = False, include_hidden: bool = False, max_results: int = 1000, skip_dirs: Optional[List[str]] = None, writer: Optional[Callable[[str], Any]] = None, **kwargs: Any) -> str:
+        """Find entries matching glob; paths are also passed to writer in batches as they are found."""
         try:
             if not os.path.exists(path):
                 return f"❌ Directory '{path}' does not exist"
             
-            pattern = os.path.join(path, glob)
-            if recursive:
-                pattern = os.path.join(path, "**", glob)
-            
-            files = []
-            for file_path in Path(path).rglob(glob) if recursive else Path(path).glob(glob):
-                if not include_hidden and file_path.name.startswith('.'):
-                    continue
-                files.append(str(file_path))
+            if skip_dirs is None:
+                # include_hidden asks for everything, including dependency and build trees
+                skip = frozenset() if include_hidden else DEFAULT_SKIP_DIRS
+            else:
+                skip = frozenset(skip_dirs)
+            files = await _collect_streamed(
+                _iter_by_name(path, glob, recursive, include_hidden, skip), max_results, writer
+            )
             
             if files:
-                result_text = "\n".join(files[:20])  # Limit to first 20 files
+                shown = files[:20]  # Limit to first 20 files
                 if len(files) > 20:
-                    result_text += f"\n... and {len(files) - 20} more files"
-                return f"📁 **Found {len(files)} files** matching '{glob}' in '{path}':\n```\n{result_text}\n```"
+                    shown.append(f"... and {len(files) - 20} more files")
+                result_text = "\n".join(shown)
+                found = f"{len(files)}+" if len(files) >= max_results else len(files)
+                return f"📁 **Found {found} files** matching '{glob}' in '{path}':\n```\n{result_text}\n```"
             else:
                 return f"📁 No files found matching '{glob}' in '{path}'"
             
         except Exception as e:
             return f"❌ Error searching for files: {str(e)}"
 
+# PythonExec scripts live in one per-process directory, named by a hash of their code, so
+# re-running identical code skips the write entirely; the oldest scripts are evicted past the cap
+PYEXEC_CACHE_SIZE = 256
+_pyexec_dir: Optional[str] = None
+_pyexec_scripts: "OrderedDict[str, None]" = OrderedDict()
+# Scripts a running PythonExec call still needs, with how many calls are using each
+_pyexec_in_use: Dict[str, int] = {}
+# Serialises script writes and evictions so one call never unlinks a file another just wrote
+_pyexec_lock = asyncio.Lock()
+
+def _write_script(path: str, data: bytes, cached: bool) -> None:
+    if cached and os.path.exists(path):
+        return
+    # Rename into place so a script that is already running never sees a half-written file
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    os.close(fd)
+    try:
+        _write_fd(tmp, data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+def _discard_files(paths: List[str]) -> None:
+    for path in paths:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+async def _acquire_pyexec_script(code: str) -> str:
+    """Script file for code, pinned against eviction until _release_pyexec_script."""
+    global _pyexec_dir
+    if _pyexec_dir is None:
+        _pyexec_dir = tempfile.mkdtemp(prefix="nsai_pyexec_")
+        atexit.register(shutil.rmtree, _pyexec_dir, True)
+    data = code.encode('utf-8')
+    path = os.path.join(_pyexec_dir, f"{hashlib.blake2b(data, digest_size=8).hexdigest()}.py")
+    async with _pyexec_lock:
+        _pyexec_in_use[path] = _pyexec_in_use.get(path, 0) + 1
+        try:
+            await _run_io(_write_script, path, data, path in _pyexec_scripts)
+        except BaseException:
+            _release_pyexec_script(path)
+            raise
+        _pyexec_scripts[path] = None
+        _pyexec_scripts.move_to_end(path)
+        # Evict the oldest scripts that no running call is using
+        excess = len(_pyexec_scripts) - PYEXEC_CACHE_SIZE
+        evicted = [p for p in _pyexec_scripts if p not in _pyexec_in_use][:max(excess, 0)]
+        for evicted_path in evicted:
+            del _pyexec_scripts[evicted_path]
+        if evicted:
+            await _run_io(_discard_files, evicted)
+    return path
+
+def _release_pyexec_script(path: str) -> None:
+    if _pyexec_in_use[path] == 1:
+        del _pyexec_in_use[path]
+    else:
+        _pyexec_in_use[path] -= 1
+
 class PythonExec(BaseTool):
     name: str = "python_exec"
     description: str = "Execute Python code in a controlled environment. Use for running Python scripts, data analysis, or testing code."
@@ -461,25 +1366,17 @@ class PythonExec(BaseTool):
 
     async def execute(self, *, code: str, timeout: int = 30, working_dir: Optional[str] = None, capture_output: bool = True, **kwargs: Any) -> str:
         try:
-            # Create temporary Python file
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as temp_file:
-                temp_file.write(code)
-                temp_file_path = temp_file.name
+            # Reuse the cached script file for this exact code (written on first run)
+            script_path = await _acquire_pyexec_script(code)
             
             # Execute Python file
-            cmd = ["python3", temp_file_path]
+            cmd = ["python3", script_path]
             cwd = working_dir if working_dir else os.getcwd()
             
-            result = subprocess.run(
-                cmd, 
-                capture_output=capture_output, 
-                text=True, 
-                timeout=timeout,
-                cwd=cwd
-            )
-            
-            # Clean up temp file
-            os.unlink(temp_file_path)
+            try:
+                result = await _run_exec(cmd, timeout=timeout, cwd=cwd, capture_output=capture_output, max_output=MAX_CAPTURED_OUTPUT)
+            finally:
+                _release_pyexec_script(script_path)
             
             output = []
             if result.stdout:
@@ -497,6 +1394,21 @@ class PythonExec(BaseTool):
         except Exception as e:
             return f"❌ Error executing Python code: {str(e)}"
 
+async def _get_session(id: str, exec_dir: str) -> Dict[str, Any]:
+    """Fetch or create the shell session for id; creation is guarded so callers share one session."""
+    async with _sessions_lock:
+        if id not in shell_sessions:
+            shell_sessions[id] = {
+                'process': None,
+                'communicate': None,
+                'output': deque(maxlen=SHELL_HISTORY_SIZE),
+                'shell': _PersistentShell(),
+                'lock': asyncio.Lock(),
+                'working_dir': exec_dir,
+                'created_at': time.time()
+            }
+        return shell_sessions[id]
+
 class ShellExec(BaseTool):
     name: str = "shell_exec"
     description: str = "Execute commands in a specified shell session. Use for running code, installing packages, or managing files."
@@ -529,58 +1441,47 @@ class ShellExec(BaseTool):
 
     async def execute(self, *, id: str, exec_dir: str, command: str, timeout: int = 60, background: bool = False, **kwargs: Any) -> str:
         try:
-            if id not in shell_sessions:
-                shell_sessions[id] = {
-                    'process': None,
-                    'output': [],
-                    'working_dir': exec_dir,
-                    'created_at': time.time()
-                }
+            session = await _get_session(id, exec_dir)
             
-            session = shell_sessions[id]
-            session['working_dir'] = exec_dir
-            
-            if background:
-                # Run command in background
-                process = subprocess.Popen(
-                    command,
-                    shell=True,
-                    cwd=exec_dir,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True
-                )
-                session['process'] = process
-                return f"🔄 Command started in background (PID: {process.pid})"
-            else:
-                # Run command and wait for completion
-                result = subprocess.run(
-                    command,
-                    shell=True,
-                    cwd=exec_dir,
-                    capture_output=True,
-                    text=True,
-                    timeout=timeout
-                )
+            # One command at a time per session; other session ids proceed independently
+            async with session['lock']:
+                session['working_dir'] = exec_dir
                 
-                output = []
-                if result.stdout:
-                    output.append(f"📤 **Output**:\n{result.stdout}")
-                if result.stderr:
-                    output.append(f"⚠️ **Errors**:\n{result.stderr}")
-                
-                session['output'].append({
-                    'command': command,
-                    'returncode': result.returncode,
-                    'stdout': result.stdout,
-                    'stderr': result.stderr,
-                    'timestamp': time.time()
-                })
-                
-                if output:
-                    return "\n\n".join(output)
+                if background:
+                    # Run command in background
+                    process = await asyncio.create_subprocess_shell(
+                        command,
+                        cwd=exec_dir,
+                        stdout=asyncio.subprocess.PIPE,
+                        stderr=asyncio.subprocess.PIPE,
+                        close_fds=False
+                    )
+                    session['process'] = process
+                    # Drain pipes as soon as the process starts so it never blocks on a full pipe
+                    session['communicate'] = asyncio.ensure_future(_collect_output(process, MAX_CAPTURED_OUTPUT))
+                    return f"🔄 Command started in background (PID: {process.pid})"
                 else:
-                    return f"✅ Command executed successfully (return code: {result.returncode})"
+                    # Run command and wait for completion
+                    result = await session['shell'].run(command, timeout=timeout, cwd=exec_dir, max_output=MAX_CAPTURED_OUTPUT)
+                    
+                    output = []
+                    if result.stdout:
+                        output.append(f"📤 **Output**:\n{result.stdout}")
+                    if result.stderr:
+                        output.append(f"⚠️ **Errors**:\n{result.stderr}")
+                    
+                    session['output'].append({
+                        'command': command,
+                        'returncode': result.returncode,
+                        'stdout': _clip_history(result.stdout),
+                        'stderr': _clip_history(result.stderr),
+                        'timestamp': time.time()
+                    })
+                    
+                    if output:
+                        return "\n\n".join(output)
+                    else:
+                        return f"✅ Command executed successfully (return code: {result.returncode})"
             
         except subprocess.TimeoutExpired:
             return f"⏰ Command timed out after {timeout} seconds"
@@ -611,22 +1512,22 @@ class ShellView(BaseTool):
                 return f"❌ Shell session '{id}' not found"
             
             session = shell_sessions[id]
-            output = session['output'][-last_n:] if session['output'] else []
+            output = list(session['output'])[-last_n:]
             
             if not output:
                 return f"📋 No command history for session '{id}'"
             
-            result = f"📋 **Shell Session '{id}'** (last {len(output)} commands):\n\n"
+            parts = [f"📋 **Shell Session '{id}'** (last {len(output)} commands):\n\n"]
             for i, cmd_output in enumerate(output, 1):
-                result += f"**Command {i}**: `{cmd_output['command']}`\n"
-                result += f"**Return Code**: {cmd_output['returncode']}\n"
+                parts.append(f"**Command {i}**: `{cmd_output['command']}`\n")
+                parts.append(f"**Return Code**: {cmd_output['returncode']}\n")
                 if cmd_output['stdout']:
-                    result += f"**Output**:\n```\n{cmd_output['stdout']}\n```\n"
+                    parts.append(f"**Output**:\n```\n{cmd_output['stdout']}\n```\n")
                 if cmd_output['stderr']:
-                    result += f"**Errors**:\n```\n{cmd_output['stderr']}\n```\n"
-                result += "---\n"
+                    parts.append(f"**Errors**:\n```\n{cmd_output['stderr']}\n```\n")
+                parts.append("---\n")
             
-            return result
+            return "".join(parts)
             
         except Exception as e:
             return f"❌ Error viewing shell session: {str(e)}"
@@ -661,17 +1562,27 @@ class ShellWait(BaseTool):
                 return f"📋 No running process in session '{id}'"
             
             try:
-                stdout, stderr = process.communicate(timeout=seconds if seconds > 0 else None)
+                # shield() keeps the drain task (and whatever it has read) alive across timeouts
+                stdout, stderr = await asyncio.wait_for(
+                    asyncio.shield(session['communicate']),
+                    timeout=seconds if seconds > 0 else None
+                )
+                stdout, stderr = _decode_output(stdout), _decode_output(stderr)
+                
+                if session['process'] is not process:
+                    # A concurrent shell_wait already recorded this process
+                    return f"✅ Background process completed (return code: {process.returncode})"
                 
                 session['output'].append({
                     'command': 'Background process completed',
                     'returncode': process.returncode,
-                    'stdout': stdout,
-                    'stderr': stderr,
+                    'stdout': _clip_history(stdout),
+                    'stderr': _clip_history(stderr),
                     'timestamp': time.time()
                 })
                 
                 session['process'] = None
+                session['communicate'] = None
                 
                 output = []
                 if stdout:
@@ -684,7 +1595,7 @@ class ShellWait(BaseTool):
                 else:
                     return f"✅ Background process completed (return code: {process.returncode})"
                 
-            except subprocess.TimeoutExpired:
+            except asyncio.TimeoutError:
                 return f"⏰ Process still running after {seconds} seconds"
             
         except Exception as e:
@@ -711,26 +1622,40 @@ class FileCopy(BaseTool):
             "preserve_attributes": {
                 "type": "boolean",
                 "description": "(Optional) Whether to preserve file attributes"
+            },
+            "reflink": {
+                "type": "boolean",
+                "description": "(Optional) Clone copy-on-write where the filesystem supports it (default: true)"
             }
         },
         "required": ["source", "destination"]
     }
 
-    async def execute(self, *, source: str, destination: str, recursive: bool = False, preserve_attributes: bool = False, **kwargs: Any) -> str:
+    async def execute(self, *, source: str, destination: str, recursive: bool = False, preserve_attributes: bool = False, reflink: bool = True, **kwargs: Any) -> str:
         try:
             if not os.path.exists(source):
                 return f"❌ Source '{source}' does not exist"
             
+            # Off the event loop: the tree walk runs on a default-executor thread (it blocks
+            # on its own I/O pool jobs), single files on the I/O pool directly
             if os.path.isdir(source) and recursive:
-                shutil.copytree(source, destination, dirs_exist_ok=True)
+                await asyncio.to_thread(_copy_tree_parallel, source, destination, reflink)
             else:
-                shutil.copy2(source, destination) if preserve_attributes else shutil.copy(source, destination)
+                await asyncio.get_running_loop().run_in_executor(
+                    _get_io_pool(), _copy_file, source, destination, preserve_attributes, reflink
+                )
             
             return f"✅ Copied '{source}' to '{destination}'"
             
         except Exception as e:
             return f"❌ Error copying '{source}' to '{destination}': {str(e)}"
 
+def _path_is_dir(path: str) -> Optional[bool]:
+    """Whether path is a directory, or None if it does not exist."""
+    if not os.path.exists(path):
+        return None
+    return os.path.isdir(path)
+
 class FileDelete(BaseTool):
     name: str = "file_delete"
     description: str = "Delete files or directories. Use for cleaning up temporary files or removing unwanted content."
@@ -755,22 +1680,36 @@ class FileDelete(BaseTool):
 
     async def execute(self, *, path: str, recursive: bool = False, force: bool = False, **kwargs: Any) -> str:
         try:
-            if not os.path.exists(path):
+            is_dir = await _run_io(_path_is_dir, path)
+            if is_dir is None:
                 return f"❌ Path '{path}' does not exist"
             
-            if os.path.isdir(path):
-                if recursive:
-                    shutil.rmtree(path)
-                else:
-                    os.rmdir(path)
+            if is_dir and recursive:
+                await _remove_tree_parallel(path)
             else:
-                os.remove(path)
+                await _run_io(os.rmdir if is_dir else os.remove, path)
             
             return f"✅ Deleted '{path}'"
             
         except Exception as e:
             return f"❌ Error deleting '{path}': {str(e)}"
 
+def _make_dir(path: str, parents: bool, mode: int) -> None:
+    """mkdir, or mkdir -p with parents; no exists() pre-check, the syscall itself reports it.
+
+    The common case of a missing leaf under an existing parent is a single mkdir; the
+    os.makedirs walk up the tree only runs when the parent is missing too.
+    """
+    try:
+        os.mkdir(path, mode)
+    except FileNotFoundError:
+        if not parents:
+            raise
+        os.makedirs(path, mode, exist_ok=True)
+    except FileExistsError:
+        if not parents or not os.path.isdir(path):
+            raise
+
 class DirectoryCreate(BaseTool):
     name: str = "directory_create"
     description: str = "Create directories. Use for organizing files or setting up project structure."
@@ -795,12 +1734,76 @@ class DirectoryCreate(BaseTool):
 
     async def execute(self, *, path: str, parents: bool = True, mode: Optional[int] = None, **kwargs: Any) -> str:
         try:
-            os.makedirs(path, mode=mode, exist_ok=True)
+            await asyncio.get_running_loop().run_in_executor(
+                _get_io_pool(), _make_dir, path, parents, 0o777 if mode is None else mode
+            )
             return f"✅ Created directory '{path}'"
             
         except Exception as e:
             return f"❌ Error creating directory '{path}': {str(e)}"
 
+# Gap between the priming and reading passes of ProcessList's per-process CPU sample
+PROCESS_CPU_SAMPLE_INTERVAL = 0.1
+
+# Process objects reused across ProcessList calls so their CPU baselines carry over and the
+# priming pass can be skipped; psutil.Process.is_running() compares create_time to catch pid reuse
+_process_cache: Dict[int, psutil.Process] = {}
+
+def _match_processes(pattern: str, user: str) -> Tuple[List[Tuple[psutil.Process, Dict[str, Any]]], bool]:
+    """Processes passing ProcessList's filters, and whether any of their CPU meters was just primed.
+
+    The pattern is lowercased once and the filters run on name, then username, before any
+    other /proc reads. Only matched processes are
+    primed and cached; the cache is rebuilt from live pids each call so exited ones drop out.
+    """
+    global _process_cache
+    pattern = pattern.lower()
+    cache = {}
+    matched = []
+    primed = False
+    for pid in psutil.pids():
+        try:
+            proc = _process_cache.get(pid)
+            cached = proc is not None and proc.is_running()
+            if not cached:
+                proc = psutil.Process(pid)
+            # Fetched one at a time so a rejected name costs only the name read (/proc/<pid>/stat)
+            # and never the uid lookup behind username; unreadable fields come back as ''
+            name = proc.as_dict(['name'], ad_value='')['name']
+            if pattern and pattern not in name.lower():
+                continue
+            username = proc.as_dict(['username'], ad_value='')['username']
+            if user and username != user:
+                continue
+            proc_info = {'pid': pid, 'name': name, 'username': username}
+            if not cached:
+                # The first non-blocking reading only records a baseline
+                proc.cpu_percent(interval=None)
+                primed = True
+            cache[pid] = proc
+            matched.append((proc, proc_info))
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    _process_cache = cache
+    return matched, primed
+
+def _sample_processes(matched: List[Tuple[psutil.Process, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    processes = []
+    for proc, proc_info in matched:
+        try:
+            # One read of /proc/<pid>/stat and status serves both attributes
+            with proc.oneshot():
+                proc_info['cpu_percent'] = proc.cpu_percent(interval=None)
+                proc_info['memory_percent'] = proc.memory_percent()
+            processes.append(proc_info)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    return processes
+
+# ProcessList table layout, formatted once per row with format_map
+PROCESS_HEADER = "🖥️ **Running Processes**:\nPID\tName\t\tUser\t\tCPU%\tMemory%\n" + "-" * 60 + "\n"
+PROCESS_ROW = "{pid}\t{name:<15.15}\t{username:<10}\t{cpu_percent:.1f}\t{memory_percent:.1f}\n"
+
 class ProcessList(BaseTool):
     name: str = "process_list"
     description: str = "List running processes. Use for monitoring system activity or finding specific processes."
@@ -825,35 +1828,137 @@ class ProcessList(BaseTool):
 
     async def execute(self, *, pattern: str = "", user: str = "", limit: int = 20, **kwargs: Any) -> str:
         try:
-            processes = []
-            for proc in psutil.process_iter(['pid', 'name', 'username', 'cpu_percent', 'memory_percent']):
-                try:
-                    proc_info = proc.info
-                    if pattern and pattern.lower() not in proc_info['name'].lower():
-                        continue
-                    if user and proc_info['username'] != user:
-                        continue
-                    processes.append(proc_info)
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
+            # Two non-blocking passes around a short sleep give real CPU deltas
+            # without holding a thread (or the event loop) in cpu_percent(interval=...);
+            # when every match was cached from an earlier call the baseline already exists
+            loop = asyncio.get_running_loop()
+            matched, primed = await loop.run_in_executor(_get_io_pool(), _match_processes, pattern, user)
+            if primed:
+                await asyncio.sleep(PROCESS_CPU_SAMPLE_INTERVAL)
+            processes = await loop.run_in_executor(_get_io_pool(), _sample_processes, matched)
             
             # Sort by CPU usage
-            processes.sort(key=lambda x: x['cpu_percent'] or 0, reverse=True)
+            processes.sort(key=lambda x: x['cpu_percent'], reverse=True)
             processes = processes[:limit]
             
             if processes:
-                result = "🖥️ **Running Processes**:\n"
-                result += "PID\tName\t\tUser\t\tCPU%\tMemory%\n"
-                result += "-" * 60 + "\n"
-                for proc in processes:
-                    result += f"{proc['pid']}\t{proc['name'][:15]:<15}\t{proc['username']:<10}\t{proc['cpu_percent']:.1f}\t{proc['memory_percent']:.1f}\n"
-                return result
+                parts = [PROCESS_HEADER]
+                parts.extend(PROCESS_ROW.format_map(proc) for proc in processes)
+                return "".join(parts)
             else:
                 return "🖥️ No processes found matching criteria"
             
         except Exception as e:
             return f"❌ Error listing processes: {str(e)}"
 
+@lru_cache(maxsize=1)
+def _static_system_info() -> Dict[str, Any]:
+    """System facts that cannot change for the lifetime of the process."""
+    return {
+        'platform': platform.platform(),
+        'python_version': platform.python_version(),
+        'architecture': platform.architecture()[0],
+        'cpu_count': psutil.cpu_count(),
+    }
+
+# Disk usage changes slowly; back-to-back system_info calls within this window reuse one statvfs
+DISK_USAGE_TTL = 2.0
+_disk_usage_cache: Dict[str, Tuple[float, Any]] = {}
+
+def _cached_disk_usage(path: str) -> Any:
+    now = time.monotonic()
+    cached = _disk_usage_cache.get(path)
+    if cached is None or now - cached[0] > DISK_USAGE_TTL:
+        cached = (now, psutil.disk_usage(path))
+        _disk_usage_cache[path] = cached
+    return cached[1]
+
+# psutil.cpu_percent(interval=None) reports usage since its previous call, so samples closer
+# together than this are too short to be meaningful; the last value is reused instead
+CPU_SAMPLE_MIN_INTERVAL = 0.2
+_cpu_sample: Dict[str, float] = {'ts': time.monotonic(), 'val': 0.0}
+# Start the first measurement window now so the first SystemInfo call has a real delta
+psutil.cpu_percent(interval=None)
+
+def _cached_cpu_percent() -> float:
+    now = time.monotonic()
+    if now - _cpu_sample['ts'] >= CPU_SAMPLE_MIN_INTERVAL:
+        _cpu_sample['val'] = psutil.cpu_percent(interval=None)
+        _cpu_sample['ts'] = now
+    return _cpu_sample['val']
+
+# Hostname/IP change rarely, but resolving them can stall for the resolver timeout on
+# misconfigured hosts, so SystemInfo refreshes them at most this often
+HOST_INFO_TTL = 60.0
+_host_info: Dict[str, Any] = {'ts': None, 'host': '', 'ip': ''}
+
+def _cached_host_info() -> Tuple[str, str]:
+    now = time.monotonic()
+    if _host_info['ts'] is None or now - _host_info['ts'] > HOST_INFO_TTL:
+        host = socket.gethostname()
+        try:
+            ip = socket.getaddrinfo(host, None, family=socket.AF_INET)[0][4][0]
+        except OSError:
+            ip = 'N/A'
+        _host_info.update(ts=now, host=host, ip=ip)
+    return _host_info['host'], _host_info['ip']
+
+def _cpu_info() -> Dict[str, Any]:
+    return {'cpu_percent': _cached_cpu_percent()}
+
+def _memory_info() -> Dict[str, Any]:
+    memory = psutil.virtual_memory()
+    return {
+        'memory_total': f"{memory.total // (1024**3):.1f} GB",
+        'memory_available': f"{memory.available // (1024**3):.1f} GB",
+        'memory_percent': f"{memory.percent:.1f}%",
+    }
+
+def _disk_info() -> Dict[str, Any]:
+    disk = _cached_disk_usage('/')
+    return {
+        'disk_total': f"{disk.total // (1024**3):.1f} GB",
+        'disk_free': f"{disk.free // (1024**3):.1f} GB",
+        'disk_percent': f"{disk.percent:.1f}%",
+    }
+
+def _network_info() -> Dict[str, Any]:
+    network = psutil.net_io_counters()
+    return {
+        'network_bytes_sent': f"{network.bytes_sent // (1024**2):.1f} MB",
+        'network_bytes_recv': f"{network.bytes_recv // (1024**2):.1f} MB",
+    }
+
+@lru_cache(maxsize=1)
+def _boot_info() -> Dict[str, Any]:
+    """Fixed for the life of the host, so computed once like _static_system_info."""
+    return {'boot_time': datetime.fromtimestamp(psutil.boot_time()).strftime('%Y-%m-%d %H:%M:%S')}
+
+def _host_info_fields() -> Dict[str, Any]:
+    hostname, ip_address = _cached_host_info()
+    return {'hostname': hostname, 'ip_address': ip_address}
+
+def _load_info() -> Dict[str, Any]:
+    # Load average (Linux only)
+    try:
+        load_avg = os.getloadavg()
+        return {'load_average': f"{load_avg[0]:.2f}, {load_avg[1]:.2f}, {load_avg[2]:.2f}"}
+    except OSError:
+        return {'load_average': "N/A"}
+
+# SystemInfo field groups in display order; a probe runs only when its group is requested
+SYSTEM_INFO_PROBES = {
+    'cpu': _cpu_info,
+    'memory': _memory_info,
+    'disk': _disk_info,
+    'network': _network_info,
+    'boot_time': _boot_info,
+    'host': _host_info_fields,
+    'load_average': _load_info,
+}
+# Groups reported when neither fields nor detailed is given
+SYSTEM_INFO_BASIC = ('cpu', 'memory', 'disk', 'network')
+
 class SystemInfo(BaseTool):
     name: str = "system_info"
     description: str = "Get system information. Use for monitoring system resources or debugging."
@@ -862,60 +1967,46 @@ class SystemInfo(BaseTool):
         "properties": {
             "detailed": {
                 "type": "boolean",
-                "description": "(Optional) Whether to include detailed information"
+                "description": "(Optional) Whether to include detailed information (all fields)"
+            },
+            "fields": {
+                "type": "array",
+                "items": {
+                    "type": "string",
+                    "enum": ["cpu", "memory", "disk", "network", "boot_time", "host", "load_average"]
+                },
+                "description": "(Optional) Only collect these field groups (default: cpu, memory, disk, network)"
             }
         },
         "required": []
     }
 
-    async def execute(self, *, detailed: bool = False, **kwargs: Any) -> str:
+    async def execute(self, *, detailed: bool = False, fields: Optional[List[str]] = None, **kwargs: Any) -> str:
         try:
-            info = {}
-            
-            # Basic system info
-            info['platform'] = platform.platform()
-            info['python_version'] = platform.python_version()
-            info['architecture'] = platform.architecture()[0]
-            
-            # CPU info
-            info['cpu_count'] = psutil.cpu_count()
-            info['cpu_percent'] = psutil.cpu_percent(interval=1)
-            
-            # Memory info
-            memory = psutil.virtual_memory()
-            info['memory_total'] = f"{memory.total // (1024**3):.1f} GB"
-            info['memory_available'] = f"{memory.available // (1024**3):.1f} GB"
-            info['memory_percent'] = f"{memory.percent:.1f}%"
-            
-            # Disk info
-            disk = psutil.disk_usage('/')
-            info['disk_total'] = f"{disk.total // (1024**3):.1f} GB"
-            info['disk_free'] = f"{disk.free // (1024**3):.1f} GB"
-            info['disk_percent'] = f"{disk.percent:.1f}%"
-            
-            # Network info
-            network = psutil.net_io_counters()
-            info['network_bytes_sent'] = f"{network.bytes_sent // (1024**2):.1f} MB"
-            info['network_bytes_recv'] = f"{network.bytes_recv // (1024**2):.1f} MB"
-            
             if detailed:
-                # Additional detailed info
-                info['boot_time'] = datetime.fromtimestamp(psutil.boot_time()).strftime('%Y-%m-%d %H:%M:%S')
-                info['hostname'] = socket.gethostname()
-                info['ip_address'] = socket.gethostbyname(socket.gethostname())
-                
-                # Load average (Linux only)
-                try:
-                    load_avg = os.getloadavg()
-                    info['load_average'] = f"{load_avg[0]:.2f}, {load_avg[1]:.2f}, {load_avg[2]:.2f}"
-                except:
-                    info['load_average'] = "N/A"
-            
-            result = "🖥️ **System Information**:\n"
+                groups = list(SYSTEM_INFO_PROBES)
+            else:
+                groups = list(dict.fromkeys(fields)) if fields else list(SYSTEM_INFO_BASIC)
+            unknown = [group for group in groups if group not in SYSTEM_INFO_PROBES]
+            if unknown:
+                return f"❌ Unknown system info fields: {', '.join(unknown)} (available: {', '.join(SYSTEM_INFO_PROBES)})"
+            
+            # Basic system info (cached, never changes while running)
+            info = dict(_static_system_info())
+            
+            # Only the requested probes run, in parallel worker threads: wall time
+            # is the slowest probe rather than the sum of all of them
+            results = await asyncio.gather(
+                *(asyncio.to_thread(SYSTEM_INFO_PROBES[group]) for group in groups)
+            )
+            for result in results:
+                info.update(result)
+            
+            parts = ["🖥️ **System Information**:\n"]
             for key, value in info.items():
-                result += f"**{key.replace('_', ' ').title()}**: {value}\n"
+                parts.append(f"**{key.replace('_', ' ').title()}**: {value}\n")
             
-            return result
+            return "".join(parts)
             
         except Exception as e:
             return f"❌ Error getting system information: {str(e)}"
@@ -944,25 +2035,74 @@ class NetworkTest(BaseTool):
 
     async def execute(self, *, host: str, port: int = 80, timeout: int = 5, **kwargs: Any) -> str:
         try:
-            # Test basic connectivity
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(timeout)
-            
-            start_time = time.time()
-            result = sock.connect_ex((host, port))
-            end_time = time.time()
-            
-            sock.close()
-            
-            if result == 0:
-                response_time = (end_time - start_time) * 1000
-                return f"✅ **Network Test**: {host}:{port} is reachable (Response time: {response_time:.2f}ms)"
-            else:
+            # Test basic connectivity; the connect is a non-blocking socket on the event loop,
+            # so concurrent probes overlap instead of each holding a thread
+            start_ns = time.monotonic_ns()
+            try:
+                _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout=timeout)
+            except (asyncio.TimeoutError, OSError):
                 return f"❌ **Network Test**: {host}:{port} is not reachable"
+            end_ns = time.monotonic_ns()
+            writer.close()
+            # The peer may reset the connection as we close it; the host was still reachable
+            with contextlib.suppress(OSError):
+                await writer.wait_closed()
+            
+            response_time = (end_ns - start_ns) / 1_000_000
+            return f"✅ **Network Test**: {host}:{port} is reachable (Response time: {response_time:.2f}ms)"
             
         except Exception as e:
             return f"❌ Error testing network connectivity: {str(e)}"
 
+# Characters of response body WebRequest shows; the rest is never downloaded on the httpx path
+WEB_BODY_PREVIEW = 1000
+
+def _requests_fetch(method: str, url: str, headers: Dict, data: Optional[str], timeout: int) -> Tuple[int, float, List[Tuple[str, str]], str]:
+    """The requests-session fallback of _http_request; streams so only the preview is downloaded and decoded."""
+    session = _get_http_session()
+    import requests
+    try:
+        with session.request(
+            method=method, url=url, headers=headers, data=data, timeout=timeout, stream=True
+        ) as response:
+            # Enough bytes for WEB_BODY_PREVIEW + 1 characters even at 4 bytes each in UTF-8
+            raw = response.raw.read((WEB_BODY_PREVIEW + 1) * 4, decode_content=True)
+            text = raw.decode(response.encoding or 'utf-8', errors='replace')
+            return response.status_code, response.elapsed.total_seconds(), list(response.headers.items()), text
+    except requests.exceptions.Timeout as e:
+        raise TimeoutError(str(e)) from e
+    except requests.exceptions.ConnectionError as e:
+        raise ConnectionError(str(e)) from e
+
+async def _http_request(method: str, url: str, headers: Dict, data: Optional[str], timeout: int) -> Tuple[int, float, List[Tuple[str, str]], str]:
+    """Status, seconds until response headers, headers, and body text (cut just past WEB_BODY_PREVIEW).
+
+    Either client's timeouts and connection failures surface as the builtin TimeoutError and
+    ConnectionError.
+    """
+    if not HAVE_HTTPX:
+        return await asyncio.get_running_loop().run_in_executor(
+            _get_io_pool(), _requests_fetch, method, url, headers, data, timeout
+        )
+    client = _get_http_client()
+    import httpx
+    start = time.monotonic()
+    try:
+        async with client.stream(method, url, headers=headers, content=data, timeout=timeout) as response:
+            elapsed = time.monotonic() - start
+            # Stop reading once the preview is filled so large bodies never materialize
+            chunks, size = [], 0
+            async for chunk in response.aiter_text():
+                chunks.append(chunk)
+                size += len(chunk)
+                if size > WEB_BODY_PREVIEW:
+                    break
+            return response.status_code, elapsed, list(response.headers.items()), "".join(chunks)
+    except httpx.TimeoutException as e:
+        raise TimeoutError(str(e)) from e
+    except httpx.ConnectError as e:
+        raise ConnectionError(str(e)) from e
+
 class WebRequest(BaseTool):
     name: str = "web_request"
     description: str = "Make HTTP requests to web services. Use for API calls, web scraping, or checking web services."
@@ -996,37 +2136,194 @@ class WebRequest(BaseTool):
 
     async def execute(self, *, url: str, method: str = "GET", headers: Optional[Dict] = None, data: Optional[str] = None, timeout: int = 30, **kwargs: Any) -> str:
         try:
-            response = requests.request(
-                method=method,
-                url=url,
-                headers=headers or {},
-                data=data,
-                timeout=timeout
+            status_code, elapsed, response_headers, body = await _http_request(
+                method, url, headers or {}, data, timeout
             )
             
-            result = f"🌐 **HTTP {method} Request**: {url}\n"
-            result += f"**Status Code**: {response.status_code}\n"
-            result += f"**Response Time**: {response.elapsed.total_seconds():.2f}s\n"
+            parts = [
+                f"🌐 **HTTP {method} Request**: {url}\n",
+                f"**Status Code**: {status_code}\n",
+                f"**Response Time**: {elapsed:.2f}s\n",
+            ]
             
-            if response.headers:
-                result += f"**Response Headers**:\n"
-                for key, value in list(response.headers.items())[:5]:  # Show first 5 headers
-                    result += f"  {key}: {value}\n"
+            if response_headers:
+                parts.append("**Response Headers**:\n")
+                for key, value in response_headers[:5]:  # Show first 5 headers
+                    parts.append(f"  {key}: {value}\n")
             
-            if response.text:
+            if body:
                 # Truncate response if too long
-                text = response.text[:1000] + "..." if len(response.text) > 1000 else response.text
-                result += f"**Response Body**:\n```\n{text}\n```"
+                text = body[:WEB_BODY_PREVIEW] + "..." if len(body) > WEB_BODY_PREVIEW else body
+                parts.append(f"**Response Body**:\n```\n{text}\n```")
             
-            return result
+            return "".join(parts)
             
-        except requests.exceptions.Timeout:
+        except TimeoutError:
             return f"⏰ Request to {url} timed out after {timeout} seconds"
-        except requests.exceptions.ConnectionError:
+        except ConnectionError:
             return f"❌ Connection error to {url}"
         except Exception as e:
             return f"❌ Error making request to {url}: {str(e)}"
 
+def _iter_tree(root: str, prefix: str = '') -> Iterator[Tuple[os.DirEntry, str]]:
+    """(entry, archive name) for everything under root, sorted, using the d_type scandir returned."""
+    with os.scandir(root) as it:
+        entries = sorted(it, key=lambda e: e.name)
+    for entry in entries:
+        arcname = prefix + entry.name
+        yield entry, arcname
+        # Like os.walk, symlinked directories are recorded but not descended into
+        if entry.is_dir(follow_symlinks=False):
+            yield from _iter_tree(entry.path, arcname + '/')
+
+def _zip_tree(source: str, destination: str) -> None:
+    """Stream source into a zip at destination, members relative to source like shutil.make_archive."""
+    if os.path.isdir(source):
+        # d_type decides dir/file without a stat; ZipFile.write then stats each member once
+        members = (
+            (entry.path, arcname, entry.is_dir())
+            for entry, arcname in _iter_tree(source)
+            if entry.is_dir() or entry.is_file()
+        )
+    else:
+        members = iter([(source, os.path.basename(source), False)])
+    with zipfile.ZipFile(destination, 'w', zipfile.ZIP_DEFLATED,
+                         compresslevel=ARCHIVE_COMPRESS_LEVEL, allowZip64=True) as zf:
+        for path, arcname, is_dir in members:
+            if is_dir:
+                zf.write(path, arcname)
+            elif os.path.splitext(arcname)[1].lower() in _INCOMPRESSIBLE:
+                zf.write(path, arcname, compress_type=zipfile.ZIP_STORED)
+            else:
+                zf.write(path, arcname)
+
+def _tar_tree(tar: tarfile.TarFile, source: str, arcname: str) -> None:
+    """tar.add(source, arcname) driven by scandir.
+
+    Regular files are opened first and described from fstat on the open descriptor, so
+    each one costs a single path lookup; other entries (dirs, symlinks, devices) are
+    lstat'ed by gettarinfo as tar.add would.
+    """
+    if not os.path.isdir(source) or os.path.islink(source):
+        tar.add(source, arcname=arcname)
+        return
+    tar.add(source, arcname=arcname, recursive=False)
+    own_name = os.path.abspath(tar.name) if tar.name else None
+    for entry, name in _iter_tree(source, arcname + '/'):
+        if own_name and os.path.abspath(entry.path) == own_name:
+            continue  # the archive being written lives inside the tree
+        if entry.is_file(follow_symlinks=False):
+            with open(entry.path, 'rb') as f:
+                tar.addfile(tar.gettarinfo(arcname=name, fileobj=f), f)
+        else:
+            tar.addfile(tar.gettarinfo(entry.path, arcname=name))
+
+def _with_suffix(path: str, suffix: str) -> str:
+    return path if path.endswith(suffix) else path + suffix
+
+def _compress_zip(source: str, destination: str) -> None:
+    _zip_tree(source, _with_suffix(destination, '.zip'))
+
+def _compress_tar(source: str, destination: str, gzip: bool = False) -> None:
+    path = _with_suffix(destination, '.tar.gz' if gzip else '.tar')
+    arcname = '.' if os.path.isdir(source) else os.path.basename(source)
+    # Stream member data through the (gzip) writer in 1 MiB chunks instead of 16 KiB
+    if gzip and igzip is not None:
+        with igzip.open(path, 'wb') as gz, tarfile.open(fileobj=gz, mode='w', copybufsize=ARCHIVE_COPY_BUFSIZE) as tar:
+            _tar_tree(tar, source, arcname)
+    else:
+        level = {'compresslevel': ARCHIVE_COMPRESS_LEVEL} if gzip else {}
+        with tarfile.open(path, 'w:gz' if gzip else 'w', copybufsize=ARCHIVE_COPY_BUFSIZE, **level) as tar:
+            _tar_tree(tar, source, arcname)
+
+# FileCompress handlers by format
+_COMPRESSORS = {
+    'zip': _compress_zip,
+    'tar': _compress_tar,
+    'tar.gz': partial(_compress_tar, gzip=True),
+}
+
+def _compress_archive(source: str, destination: str, format: str) -> None:
+    try:
+        compress = _COMPRESSORS[format]
+    except KeyError:
+        raise ValueError(f"Unsupported archive format: {format}") from None
+    compress(source, destination)
+
+# Zip archives at least this large (compressed) are inflated by several threads at once;
+# zlib releases the GIL while decompressing, so members extract in parallel
+ZIP_PARALLEL_MIN_BYTES = 4 * 1024 * 1024
+
+def _zip_member_path(destination: str, name: str) -> str:
+    """Where ZipFile.extract puts member name: drive, '.', '..' and empty components are dropped."""
+    name = os.path.splitdrive(name.replace('/', os.sep))[1]
+    parts = [x for x in name.split(os.sep) if x not in ('', os.curdir, os.pardir)]
+    return os.path.join(destination, *parts)
+
+def _extract_zip(archive: str, destination: str) -> None:
+    with zipfile.ZipFile(archive, 'r') as zip_ref:
+        members = zip_ref.infolist()
+        # zipfile already drops '..' and absolute components; resolving each target also catches
+        # members that would be written through a symlink already inside destination (zip-slip)
+        root = os.path.realpath(destination)
+        for member in members:
+            target = os.path.realpath(_zip_member_path(root, member.filename))
+            if target != root and not target.startswith(root + os.sep):
+                raise ValueError(f"Archive member '{member.filename}' would extract outside '{destination}'")
+        files = [m for m in members if not m.is_dir()]
+        if len(files) < 2 or sum(m.compress_size for m in files) < ZIP_PARALLEL_MIN_BYTES:
+            zip_ref.extractall(destination)
+            return
+        # ZipFile.extract checks exists() before makedirs(), which races between threads,
+        # so every directory is created here first
+        for member in members:
+            target = _zip_member_path(destination, member.filename)
+            os.makedirs(target if member.is_dir() else os.path.dirname(target), exist_ok=True)
+    # A ZipFile handle has one file position, so each worker thread opens its own
+    local = threading.local()
+    handles = []
+    def extract(member: zipfile.ZipInfo) -> None:
+        if not hasattr(local, 'zip_ref'):
+            local.zip_ref = zipfile.ZipFile(archive, 'r')
+            handles.append(local.zip_ref)
+        local.zip_ref.extract(member, destination)
+    try:
+        with ThreadPoolExecutor(max_workers=min(len(files), os.cpu_count() or 1)) as executor:
+            list(executor.map(extract, files))
+    finally:
+        for handle in handles:
+            handle.close()
+
+def _extract_tar(archive: str, destination: str, gzip: bool = False) -> None:
+    if gzip and igzip is not None:
+        with igzip.open(archive, 'rb') as gz, tarfile.open(fileobj=gz, mode='r') as tar_ref:
+            # 'data' rejects absolute paths, '..' escapes and special files (CVE-2007-4559)
+            tar_ref.extractall(destination, filter='data')
+    else:
+        with tarfile.open(archive, 'r:gz' if gzip else 'r') as tar_ref:
+            tar_ref.extractall(destination, filter='data')
+
+# FileExtract handlers by format, and the format implied by an archive's final suffix
+_EXTRACTORS = {
+    'zip': _extract_zip,
+    'tar': _extract_tar,
+    'tar.gz': partial(_extract_tar, gzip=True),
+}
+# Matched against the end of the name, so a plain compressed file like data.csv.gz isn't taken for a tarball
+_ARCHIVE_SUFFIXES = {'.zip': 'zip', '.tar': 'tar', '.tar.gz': 'tar.gz', '.tgz': 'tar.gz'}
+
+def _extract_archive(archive: str, destination: str, format: str) -> None:
+    if format == "auto":
+        name = archive.lower()
+        format = next((fmt for suffix, fmt in _ARCHIVE_SUFFIXES.items() if name.endswith(suffix)), None)
+        if format is None:
+            raise ValueError("Cannot infer archive format from the file name; pass format explicitly")
+    try:
+        extract = _EXTRACTORS[format]
+    except KeyError:
+        raise ValueError(f"Unsupported archive format: {format}") from None
+    extract(archive, destination)
+
 class FileCompress(BaseTool):
     name: str = "file_compress"
     description: str = "Compress files or directories into archive formats. Use for creating backups or reducing file sizes."
@@ -1055,15 +2352,8 @@ class FileCompress(BaseTool):
             if not os.path.exists(source):
                 return f"❌ Source '{source}' does not exist"
             
-            if format == "zip":
-                if os.path.isdir(source):
-                    shutil.make_archive(destination.replace('.zip', ''), 'zip', source)
-                else:
-                    shutil.make_archive(destination.replace('.zip', ''), 'zip', os.path.dirname(source), os.path.basename(source))
-            elif format == "tar":
-                shutil.make_archive(destination.replace('.tar', ''), 'tar', source)
-            elif format == "tar.gz":
-                shutil.make_archive(destination.replace('.tar.gz', ''), 'gztar', source)
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(_get_cpu_pool(), _compress_archive, source, destination, format)
             
             return f"✅ Compressed '{source}' to '{destination}'"
             
@@ -1098,25 +2388,10 @@ class FileExtract(BaseTool):
             if not os.path.exists(archive):
                 return f"❌ Archive '{archive}' does not exist"
             
-            os.makedirs(destination, exist_ok=True)
-            
-            if format == "auto":
-                if archive.endswith('.zip'):
-                    format = "zip"
-                elif archive.endswith('.tar.gz'):
-                    format = "tar.gz"
-                elif archive.endswith('.tar'):
-                    format = "tar"
-            
-            if format == "zip":
-                import zipfile
-                with zipfile.ZipFile(archive, 'r') as zip_ref:
-                    zip_ref.extractall(destination)
-            elif format in ["tar", "tar.gz"]:
-                import tarfile
-                mode = 'r:gz' if format == "tar.gz" else 'r'
-                with tarfile.open(archive, mode) as tar_ref:
-                    tar_ref.extractall(destination)
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(_get_io_pool(), partial(os.makedirs, destination, exist_ok=True))
+            
+            await loop.run_in_executor(_get_cpu_pool(), _extract_archive, archive, destination, format)
             
             return f"✅ Extracted '{archive}' to '{destination}'"
             
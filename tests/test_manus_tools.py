@@ -0,0 +1,355 @@
+import asyncio
+import gzip
+import os
+import tarfile
+
+import pytest
+
+from app.tool import manus_tools
+from app.tool.manus_tools import (
+    FileDelete, FileFindByName, FileFindInContent, FileRead, FileStrReplace, FileWrite, NetworkTest,
+)
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/meminfo"), reason="needs procfs")
+def test_find_in_content_reads_size_zero_pseudo_files():
+    assert os.stat("/proc/meminfo").st_size == 0
+    result = run(FileFindInContent().execute(file="/proc/meminfo", regex="MemTotal"))
+    assert "Found 1 matches" in result
+
+
+def test_find_in_content_empty_file(tmp_path):
+    path = tmp_path / "empty.txt"
+    path.write_text("")
+    result = run(FileFindInContent().execute(file=str(path), regex="anything"))
+    assert "No matches found" in result
+
+
+def test_find_in_content_literal_in_cr_only_file(tmp_path):
+    path = tmp_path / "mac.txt"
+    path.write_bytes(b"foo\rbar\rfoo\r")
+    result = run(FileFindInContent().execute(file=str(path), regex="foo"))
+    assert "Found 2 matches" in result
+    assert "Line 1: foo\nLine 3: foo\n" in result
+
+
+def test_find_in_content_regex_with_literal_newline(tmp_path):
+    path = tmp_path / "lines.txt"
+    path.write_text("a\nb\nc\nfoo\nbar\n")
+    result = run(FileFindInContent().execute(file=str(path), regex="fo+\nbar"))
+    assert "Line 4: foo" in result
+
+
+@pytest.mark.parametrize("regex", [r"fo+\sbar", r"fo+[^x]bar", r"(?s)fo+.bar", r"fo+\nbar", r"fo+\x0abar"])
+def test_find_in_content_cross_line_regex(tmp_path, regex):
+    path = tmp_path / "lines.txt"
+    path.write_text("a\nfoo\nbar\n")
+    result = run(FileFindInContent().execute(file=str(path), regex=regex))
+    assert "Found 1 matches" in result
+    assert "Line 2: foo" in result
+
+
+def test_find_in_content_line_local_regex(tmp_path):
+    path = tmp_path / "lines.txt"
+    path.write_text("alpha\nbeta\ngamma\nbetamax\n")
+    tool = FileFindInContent()
+    result = run(tool.execute(file=str(path), regex=r"bet\w*"))
+    assert "Line 2: beta\nLine 4: betamax\n" in result
+    result = run(tool.execute(file=str(path), regex=r"BET\w*", case_sensitive=False, max_matches=1))
+    assert "Found 1+ matches" in result
+
+
+def make_tree(root, *files):
+    for name in files:
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("")
+
+
+def found_paths(result, root):
+    """Paths in a FileFindByName report, relative to root."""
+    prefix = f"{root}{os.sep}"
+    return sorted(line[len(prefix):] for line in result.splitlines() if line.startswith(prefix))
+
+
+def test_find_by_name_searches_hidden_directories(tmp_path):
+    make_tree(tmp_path, ".github/workflows/ci.yml", "conf.yml", ".hidden.yml")
+    result = run(FileFindByName().execute(path=str(tmp_path), glob="*.yml", recursive=True))
+    assert found_paths(result, tmp_path) == [".github/workflows/ci.yml", "conf.yml"]
+
+
+def test_find_by_name_path_pattern_searches_hidden_directories(tmp_path):
+    make_tree(tmp_path, ".github/workflows/ci.yml")
+    result = run(FileFindByName().execute(path=str(tmp_path), glob="workflows/*.yml", recursive=True))
+    assert found_paths(result, tmp_path) == [".github/workflows/ci.yml"]
+
+
+def test_find_by_name_prunes_skip_dirs_when_recursive(tmp_path):
+    make_tree(tmp_path, "src/app.js", "node_modules/lib/index.js", "build/out.js")
+    tool = FileFindByName()
+    result = run(tool.execute(path=str(tmp_path), glob="*.js", recursive=True))
+    assert found_paths(result, tmp_path) == ["src/app.js"]
+    result = run(tool.execute(path=str(tmp_path), glob="*.js", recursive=True, skip_dirs=[]))
+    assert len(found_paths(result, tmp_path)) == 3
+    result = run(tool.execute(path=str(tmp_path), glob="*.js", recursive=True, include_hidden=True))
+    assert len(found_paths(result, tmp_path)) == 3
+
+
+def test_find_by_name_searches_skip_dirs_named_in_pattern(tmp_path):
+    make_tree(tmp_path, "build/out.js", "pkg/build/lib.js", "node_modules/dep/build/dep.js")
+    tool = FileFindByName()
+    result = run(tool.execute(path=str(tmp_path), glob="build/*.js"))
+    assert found_paths(result, tmp_path) == ["build/out.js"]
+    result = run(tool.execute(path=str(tmp_path), glob="build/*.js", recursive=True))
+    assert found_paths(result, tmp_path) == ["build/out.js", "pkg/build/lib.js"]
+
+
+def test_file_write_replaces_symlink_target(tmp_path):
+    target = tmp_path / "target.txt"
+    target.write_text("old")
+    link = tmp_path / "link.txt"
+    link.symlink_to(target)
+    result = run(FileWrite().execute(file=str(link), content="new"))
+    assert "written to" in result
+    assert link.is_symlink()
+    assert target.read_text() == "new"
+
+
+def test_file_write_concurrent_writes_to_one_path(tmp_path):
+    path = tmp_path / "out.txt"
+
+    async def write_all():
+        tool = FileWrite()
+        return await asyncio.gather(*(tool.execute(file=str(path), content=str(i) * 100000) for i in range(8)))
+
+    results = run(write_all())
+    assert all("written to" in r for r in results)
+    content = path.read_text()
+    assert content in {str(i) * 100000 for i in range(8)}
+    assert sorted(os.listdir(tmp_path)) == ["out.txt"]
+
+
+@pytest.mark.parametrize("start_line, end_line", [(1, 3), (1, None)])
+def test_file_read_range_normalises_crlf(tmp_path, start_line, end_line):
+    path = tmp_path / "crlf.txt"
+    path.write_bytes(b"a\r\nb\r\nc\r\n")
+    result = run(FileRead().execute(file=str(path), start_line=start_line, end_line=end_line))
+    assert "\r" not in result
+    assert "```\nb\nc\n```" in result
+
+
+def test_file_read_range_utf16(tmp_path):
+    path = tmp_path / "wide.txt"
+    path.write_text("first\nsecond\nthird\n", encoding="utf-16")
+    result = run(FileRead().execute(file=str(path), start_line=1, end_line=2, encoding="utf-16"))
+    assert "(lines 1-2)" in result
+    assert "```\nsecond\n```" in result
+
+
+@pytest.mark.parametrize("old_str, new_str, expected", [
+    ("beta", "BETA", b"alpha\nBETA\ngamma\n"),        # same length
+    ("beta", "b", b"alpha\nb\ngamma\n"),              # length change
+    ("alpha\nbeta", "ab", b"ab\ngamma\n"),            # spans a line break
+])
+def test_str_replace_literal(tmp_path, old_str, new_str, expected):
+    path = tmp_path / "f.txt"
+    path.write_bytes(b"alpha\nbeta\ngamma\n")
+    result = run(FileStrReplace().execute(file=str(path), old_str=old_str, new_str=new_str))
+    assert "String replaced" in result
+    assert path.read_bytes() == expected
+
+
+def test_same_length_str_replace_is_atomic_and_seen_by_reads(tmp_path):
+    path = tmp_path / "f.txt"
+    path.write_bytes(b"alpha\nbeta\n")
+    path.chmod(0o640)
+    inode = path.stat().st_ino
+    assert "beta" in run(FileRead().execute(file=str(path)))
+    run(FileStrReplace().execute(file=str(path), old_str="beta", new_str="BETA"))
+    # Swapped in by rename, so a reader holding the old file never sees a half-patched one
+    assert path.stat().st_ino != inode
+    assert path.stat().st_mode & 0o777 == 0o640
+    assert "BETA" in run(FileRead().execute(file=str(path)))
+
+
+def test_str_replace_literal_missing(tmp_path):
+    path = tmp_path / "f.txt"
+    path.write_bytes(b"alpha\n")
+    result = run(FileStrReplace().execute(file=str(path), old_str="zeta", new_str="x"))
+    assert "No changes made" in result
+    assert path.read_bytes() == b"alpha\n"
+
+
+def test_str_replace_multiline_literal_in_crlf_file(tmp_path):
+    path = tmp_path / "crlf.txt"
+    path.write_bytes(b"alpha\r\nbeta\r\ngamma\r\n")
+    result = run(FileStrReplace().execute(file=str(path), old_str="alpha\nbeta", new_str="ab"))
+    assert "String replaced" in result
+    assert path.read_text() == "ab\ngamma\n"
+
+
+def test_str_replace_single_line_literal_keeps_crlf(tmp_path):
+    path = tmp_path / "crlf.txt"
+    path.write_bytes(b"alpha\r\nbeta\r\n")
+    run(FileStrReplace().execute(file=str(path), old_str="beta", new_str="BETA"))
+    assert path.read_bytes() == b"alpha\r\nBETA\r\n"
+
+
+@pytest.mark.parametrize("content, old_str, new_str, expected", [
+    (b"a1\nb22\n", r"\d+", "#", "a#\nb#\n"),
+    (b"foo\nbar\n", r"o\nb", "-", "fo-ar\n"),           # across lines
+    (b"foo\r\nbar\r\n", r"foo\nbar", "x", "x\n"),      # CRLF read as text
+])
+def test_str_replace_regex(tmp_path, content, old_str, new_str, expected):
+    path = tmp_path / "f.txt"
+    path.write_bytes(content)
+    result = run(FileStrReplace().execute(file=str(path), old_str=old_str, new_str=new_str, regex=True))
+    assert "String replaced" in result
+    assert path.read_text() == expected
+
+
+def test_file_delete(tmp_path):
+    tree = tmp_path / "tree"
+    (tree / "sub").mkdir(parents=True)
+    (tree / "sub" / "f.txt").write_text("x")
+    (tree / "g.txt").write_text("y")
+    empty = tmp_path / "empty"
+    empty.mkdir()
+    tool = FileDelete()
+    assert "does not exist" in run(tool.execute(path=str(tmp_path / "missing")))
+    assert "Error deleting" in run(tool.execute(path=str(tree)))
+    assert "Deleted" in run(tool.execute(path=str(tree), recursive=True))
+    assert "Deleted" in run(tool.execute(path=str(empty)))
+    assert os.listdir(tmp_path) == []
+
+
+def test_pyexec_eviction_skips_scripts_in_use(monkeypatch):
+    monkeypatch.setattr(manus_tools, "PYEXEC_CACHE_SIZE", 1)
+
+    async def scenario():
+        running = await manus_tools._acquire_pyexec_script("print('running')")
+        finished = await manus_tools._acquire_pyexec_script("print('finished')")
+        manus_tools._release_pyexec_script(finished)
+        newest = await manus_tools._acquire_pyexec_script("print('newest')")
+        manus_tools._release_pyexec_script(newest)
+        kept = os.path.exists(running), os.path.exists(finished)
+        manus_tools._release_pyexec_script(running)
+        return kept
+
+    assert run(scenario()) == (True, False)
+
+
+def test_http_client_replaced_on_new_loop_is_closed():
+    pytest.importorskip("httpx")
+
+    async def get_client():
+        client = manus_tools._get_http_client()
+        await asyncio.sleep(0)
+        return client
+
+    first = run(get_client())
+    second = run(get_client())
+    try:
+        assert first is not second
+        assert first.is_closed
+    finally:
+        run(manus_tools._close_http_client())
+    assert second.is_closed
+
+
+class FakeShellProcess:
+    """Shell whose output ends right after the status code, without the trailing newline."""
+
+    class Stdin:
+        def write(self, data):
+            pass
+
+        async def drain(self):
+            pass
+
+    def __init__(self, stdout, stderr):
+        self.pid = -1
+        self.returncode = None
+        self.stdin = self.Stdin()
+        self.stdout = asyncio.StreamReader()
+        self.stdout.feed_data(stdout)
+        self.stdout.feed_eof()
+        self.stderr = asyncio.StreamReader()
+        self.stderr.feed_data(stderr)
+        self.stderr.feed_eof()
+
+    async def wait(self):
+        self.returncode = 0
+        return 0
+
+
+def test_persistent_shell_eof_after_marker(monkeypatch):
+    monkeypatch.setattr(manus_tools.uuid, "uuid4", lambda: type("U", (), {"hex": "x"})())
+
+    async def scenario():
+        shell = manus_tools._PersistentShell()
+        shell.process = FakeShellProcess(b"out\n__DONE_x__ 3", b"\n__DONE_x__\n")
+        result = await shell.run("true", timeout=5, cwd="/")
+        return result, shell.process
+
+    result, process = run(scenario())
+    assert (result.returncode, result.stdout) == (3, "out")
+    assert process is None
+
+
+def test_network_test_ignores_reset_while_closing(monkeypatch):
+    class ResettingWriter:
+        def close(self):
+            pass
+
+        async def wait_closed(self):
+            raise ConnectionResetError("reset by peer")
+
+    async def open_connection(host, port):
+        return None, ResettingWriter()
+
+    monkeypatch.setattr(manus_tools.asyncio, "open_connection", open_connection)
+    result = run(NetworkTest().execute(host="example.invalid", port=443))
+    assert "is reachable" in result
+
+
+def test_extract_archive_infers_tar_gz_from_compound_suffix(tmp_path):
+    source = tmp_path / "data.txt"
+    source.write_text("payload")
+    for name in ("a.tar.gz", "a.TGZ"):
+        archive = tmp_path / name
+        with tarfile.open(archive, "w:gz") as tar:
+            tar.add(source, arcname="data.txt")
+        manus_tools._extract_archive(str(archive), str(tmp_path / f"out-{name}"), "auto")
+        assert (tmp_path / f"out-{name}" / "data.txt").read_text() == "payload"
+
+
+def test_extract_archive_rejects_plain_gz(tmp_path):
+    archive = tmp_path / "app.log.gz"
+    archive.write_bytes(gzip.compress(b"log line\n"))
+    with pytest.raises(ValueError, match="Cannot infer archive format"):
+        manus_tools._extract_archive(str(archive), str(tmp_path / "out"), "auto")
+
+
+def test_line_index_cache_is_bounded_by_bytes(tmp_path, monkeypatch):
+    monkeypatch.setattr(manus_tools, "LINE_INDEX_CACHE_MAX_BYTES", 100)
+    monkeypatch.setattr(manus_tools, "_line_index_cache", manus_tools.OrderedDict())
+    monkeypatch.setattr(manus_tools, "_line_index_cache_bytes", 0)
+
+    def index(name, lines):
+        path = tmp_path / name
+        path.write_text("x\n" * lines)
+        stat = path.stat()
+        return manus_tools._line_index(str(path), stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    assert list(index("small.txt", 4)) == [0, 2, 4, 6, 8]     # 40 bytes, cached
+    index("other.txt", 4)                                     # 80 bytes in total
+    index("third.txt", 4)                                     # over budget: small.txt evicted
+    assert len(index("huge.txt", 20)) == 21                   # 168 bytes, never cached
+    cached = [os.path.basename(key[0]) for key in manus_tools._line_index_cache]
+    assert cached == ["other.txt", "third.txt"]
+    assert manus_tools._line_index_cache_bytes == 80
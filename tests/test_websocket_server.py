@@ -0,0 +1,175 @@
+import asyncio
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+import websocket_server
+from websocket_server import ChatServer, OUTBOX_MAX_FRAMES, to_epoch_ms
+
+
+class FakeTransport:
+    def __init__(self):
+        self.buffered = 0
+
+    def get_write_buffer_size(self):
+        return self.buffered
+
+
+class FakeSocket:
+    """Records sent frames; send() can be held open to imitate a slow client."""
+
+    def __init__(self):
+        self.sent = []
+        self.transport = FakeTransport()
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def send(self, frame):
+        await self.gate.wait()
+        self.sent.append(frame)
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    chat = ChatServer()
+    yield chat
+    chat.conn.close()
+
+
+@pytest.fixture
+def direct_broadcasts(monkeypatch):
+    """Capture websockets.broadcast() calls instead of writing to transports."""
+    calls = []
+    monkeypatch.setattr(websocket_server, "HAVE_WS_BROADCAST", True)
+    monkeypatch.setattr(websocket_server.websockets, "broadcast",
+                        lambda sockets, frame: calls.append((list(sockets), frame)), raising=False)
+    return calls
+
+
+def test_full_outbox_drops_oldest_frame(server):
+    outbox = asyncio.Queue(maxsize=OUTBOX_MAX_FRAMES)
+    server.outboxes["u1"] = outbox
+    for i in range(OUTBOX_MAX_FRAMES + 5):
+        server.send_to("u1", str(i))
+    assert outbox.qsize() == OUTBOX_MAX_FRAMES
+    assert outbox.get_nowait() == "5"
+
+
+def test_broadcast_bypasses_outbox_only_for_idle_clients(server, direct_broadcasts):
+    async def scenario():
+        idle, slow = FakeSocket(), FakeSocket()
+        await server.register_client(idle, "idle")
+        await server.register_client(slow, "slow")
+        # Let both sender loops drain their welcome frames
+        for _ in range(5):
+            await asyncio.sleep(0)
+        # slow's transport still holds unsent bytes, so it must not be written to directly
+        slow.transport.buffered = 4096
+        direct_broadcasts.clear()
+        await server.broadcast({"type": "system", "content": "hi"})
+        return idle, slow
+
+    idle, slow = asyncio.run(scenario())
+    assert direct_broadcasts == [([idle], '{"type":"system","content":"hi"}')]
+
+
+def test_broadcast_queues_for_client_with_send_in_flight(server, direct_broadcasts):
+    async def scenario():
+        stuck = FakeSocket()
+        stuck.gate.clear()
+        user_id = await server.register_client(stuck, "stuck")
+        # Let sender_loop take the welcome frame and block inside send()
+        for _ in range(3):
+            await asyncio.sleep(0)
+        queued = server.outboxes[user_id].qsize()
+        await server.broadcast({"type": "system", "content": "later"})
+        return server.outboxes[user_id].qsize() - queued
+
+    assert asyncio.run(scenario()) == 1
+    assert direct_broadcasts == []
+
+
+LEGACY_SCHEMA = [
+    """CREATE TABLE users (
+        id TEXT PRIMARY KEY, username TEXT UNIQUE NOT NULL, role TEXT NOT NULL,
+        connected_at TEXT NOT NULL, last_seen TEXT NOT NULL, avatar TEXT, theme TEXT DEFAULT 'dark')""",
+    """CREATE TABLE messages (
+        id TEXT PRIMARY KEY, user_id TEXT NOT NULL, username TEXT NOT NULL, content TEXT NOT NULL,
+        timestamp TEXT NOT NULL, message_type TEXT DEFAULT 'text', attachments TEXT,
+        reply_to TEXT, room TEXT DEFAULT 'general')""",
+]
+
+
+def column_types(conn, table):
+    return {row[1]: row[2] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def test_legacy_database_is_migrated(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    first = datetime(2024, 5, 1, 12, 0, 0, 250000)
+    second = datetime(2024, 5, 1, 12, 0, 1)
+    conn = sqlite3.connect("chat_database.db")
+    for statement in LEGACY_SCHEMA:
+        conn.execute(statement)
+    conn.execute("INSERT INTO users VALUES ('u1', 'bob', 'user', ?, ?, '', 'dark')",
+                 (first.isoformat(), second.isoformat()))
+    conn.executemany("INSERT INTO messages VALUES (?, 'u1', 'bob', ?, ?, 'text', '[]', ?, 'general')", [
+        ("uuid-b", "second", second.isoformat(), "uuid-a"),
+        ("uuid-a", "first", first.isoformat(), None),
+        ("uuid-c", "orphan", second.isoformat(), "uuid-gone"),
+    ])
+    conn.commit()
+    conn.close()
+
+    server = ChatServer()
+    try:
+        assert column_types(server.conn, "users")["last_seen"] == "INTEGER"
+        assert column_types(server.conn, "messages")["id"] == "INTEGER"
+        assert column_types(server.conn, "messages")["reply_to"] == "INTEGER"
+        assert server.conn.execute("SELECT connected_at, last_seen FROM users").fetchone() == (
+            to_epoch_ms(first), to_epoch_ms(second))
+
+        messages = server.load_messages()
+        assert [m.content for m in messages] == ["first", "second", "orphan"]
+        assert [m.timestamp for m in messages] == [first, second, second]
+        assert all(isinstance(m.id, int) for m in messages)
+        assert messages[0].id < messages[1].id < messages[2].id
+        assert messages[1].reply_to == messages[0].id
+        assert messages[2].reply_to is None
+        assert server.last_message_id == messages[2].id
+    finally:
+        server.conn.close()
+
+
+def test_text_reply_to_column_is_converted(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    conn = sqlite3.connect("chat_database.db")
+    conn.execute("""CREATE TABLE messages (
+        id INTEGER PRIMARY KEY, user_id TEXT NOT NULL, username TEXT NOT NULL, content TEXT NOT NULL,
+        timestamp INTEGER NOT NULL, message_type TEXT DEFAULT 'text', attachments TEXT,
+        reply_to TEXT, room TEXT DEFAULT 'general')""")
+    conn.executemany("INSERT INTO messages VALUES (?, 'u1', 'bob', ?, ?, 'text', '[]', ?, 'general')", [
+        (1024, "first", 1, None),
+        (2048, "second", 2, "1024"),
+    ])
+    conn.commit()
+    conn.close()
+
+    server = ChatServer()
+    try:
+        assert column_types(server.conn, "messages")["reply_to"] == "INTEGER"
+        assert [m.reply_to for m in server.load_messages()] == [None, 1024]
+    finally:
+        server.conn.close()
+
+
+def test_message_ids_increase_within_one_millisecond(server):
+    moment = datetime(2024, 5, 1, 12, 0, 0)
+    ids = [server.next_message_id(moment) for _ in range(3)]
+    assert ids == sorted(set(ids))
+    assert ids[-1] < 2 ** 53
@@ -2,15 +2,23 @@ import asyncio
 import json
 import logging
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Set, Optional
+from functools import lru_cache
+from typing import Dict, List, Set, Optional, Union
 import websockets
 from websockets.server import WebSocketServerProtocol
 import sqlite3
 import os
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from enum import Enum
 
+# orjson is optional: it encodes several times faster and handles datetimes natively
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -31,42 +39,170 @@ class User:
     avatar: str = ""
     theme: str = "dark"
 
-@dataclass
+@dataclass(slots=True)
 class Message:
-    id: str
+    id: int
     user_id: str
     username: str
     content: str
     timestamp: datetime
     message_type: str = "text"
     attachments: List[str] = None
-    reply_to: Optional[str] = None
+    reply_to: Optional[int] = None
+    
+    def to_dict(self) -> dict:
+        """Wire form of the message; cheaper than a recursive asdict() copy"""
+        return {
+            "id": self.id,
+            "user_id": self.user_id,
+            "username": self.username,
+            "content": self.content,
+            "timestamp": self.timestamp.isoformat(),
+            "message_type": self.message_type,
+            "attachments": self.attachments,
+            "reply_to": self.reply_to,
+        }
+
+# Queued database writes are committed together: the flusher waits this long after the
+# first pending row so a burst shares one transaction, taking at most this many rows
+DB_FLUSH_INTERVAL = 0.05
+DB_FLUSH_MAX_ROWS = 200
+
+# Message ids are the epoch millisecond shifted left by this many bits plus a sequence,
+# so they sort by time and stay below 2**53 where browsers still read them exactly
+MESSAGE_ID_SEQUENCE_BITS = 10
+
+# websockets.broadcast() arrived in websockets 10; older releases fan out through the
+# per-client sender tasks, which already send concurrently
+HAVE_WS_BROADCAST = hasattr(websockets, "broadcast")
+
+# Seconds between writes of users whose last_seen moved while chatting
+USER_FLUSH_INTERVAL = 30
+
+# Frames a client may have waiting before the oldest are dropped
+OUTBOX_MAX_FRAMES = 1000
+
+def json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def encode_frame(payload: dict) -> str:
+    """Serialize an outgoing payload compactly; broadcast calls this once for all recipients"""
+    if orjson is not None:
+        # Decoded back to str so clients keep receiving text frames
+        return orjson.dumps(payload).decode()
+    return json.dumps(payload, separators=(",", ":"), default=json_default)
+
+@lru_cache(maxsize=512)
+def typing_frame(user_id: str, username: str, is_typing: bool) -> str:
+    """Typing notices repeat on every keypress; the username in the key keeps renames correct"""
+    return encode_frame({
+        "type": "typing",
+        "user_id": user_id,
+        "username": username,
+        "is_typing": is_typing
+    })
+
+def decode_frame(frame):
+    """Parse an incoming frame (orjson.JSONDecodeError subclasses json.JSONDecodeError)"""
+    if orjson is not None:
+        return orjson.loads(frame)
+    return json.loads(frame)
+
+# Statement text is shared module-wide so sqlite3's per-connection statement cache
+# reuses the compiled statement instead of re-preparing it on every call
+USER_UPSERT_SQL = '''
+    INSERT OR REPLACE INTO users 
+    (id, username, role, connected_at, last_seen, avatar, theme)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+
+MESSAGE_INSERT_SQL = '''
+    INSERT INTO messages 
+    (id, user_id, username, content, timestamp, message_type, attachments, reply_to, room)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+ADMIN_USER_INSERT_SQL = '''
+    INSERT OR REPLACE INTO admin_users (user_id, permissions)
+    VALUES (?, ?)
+'''
+
+ADMIN_USER_IDS_SQL = "SELECT user_id FROM admin_users"
+
+MESSAGE_COUNT_SQL = "SELECT COUNT(*) FROM messages"
+
+def to_epoch_ms(moment: datetime) -> int:
+    """Datetimes are stored as integer milliseconds since the epoch"""
+    return int(moment.timestamp() * 1000)
+
+def from_epoch_ms(value: int) -> datetime:
+    return datetime.fromtimestamp(value / 1000)
+
+def user_row(user: User) -> tuple:
+    return (
+        user.id, user.username, user.role.value,
+        to_epoch_ms(user.connected_at), to_epoch_ms(user.last_seen),
+        user.avatar, user.theme
+    )
+
+def message_row(message: Message) -> tuple:
+    return (
+        message.id, message.user_id, message.username,
+        message.content, to_epoch_ms(message.timestamp),
+        message.message_type, json.dumps(message.attachments or []),
+        message.reply_to, "general"
+    )
 
 class ChatServer:
     def __init__(self, host="localhost", port=8765):
         self.host = host
         self.port = port
         self.clients: Dict[str, WebSocketServerProtocol] = {}
+        # Outgoing frames per client, each written by its own sender_loop task
+        self.outboxes: Dict[str, asyncio.Queue] = {}
+        self.senders: Dict[str, asyncio.Task] = {}
+        # Clients whose sender_loop has taken a frame that send() hasn't finished with
+        self.sending: Set[str] = set()
         self.users: Dict[str, User] = {}
-        self.messages: List[Message] = []
+        # IDs of users with is_online set, kept in step by register_client/remove_client
+        self.online_users: Set[str] = set()
         self.rooms: Dict[str, Set[str]] = {"general": set()}
         self.admin_users: Set[str] = set()
         self.db_path = "chat_database.db"
+        self.conn: Optional[sqlite3.Connection] = None
+        # Pending ("user", row) and ("message", Message) writes, drained by db_flusher once
+        # start() runs
+        self.write_queue: Optional[asyncio.Queue] = None
+        # Users whose last_seen changed in memory since their row was last queued
+        self.dirty_users: Set[str] = set()
+        # sqlite3 calls block, so the event loop hands them to this thread; SQLite
+        # serializes writers anyway, and one worker keeps the connection single-threaded
+        self.db_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chat-db")
         self.init_database()
         
     def init_database(self):
         """Initialize SQLite database for persistent storage"""
-        conn = sqlite3.connect(self.db_path)
+        # One connection for the server's lifetime instead of reopening per query
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn = self.conn
         cursor = conn.cursor()
         
+        # WAL lets readers proceed during writes and, with synchronous=NORMAL, fsyncs only
+        # at checkpoints; busy_timeout waits out other writers (e.g. setup_admin_users)
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA busy_timeout=5000")
+        
         # Create users table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS users (
                 id TEXT PRIMARY KEY,
                 username TEXT UNIQUE NOT NULL,
                 role TEXT NOT NULL,
-                connected_at TEXT NOT NULL,
-                last_seen TEXT NOT NULL,
+                connected_at INTEGER NOT NULL,
+                last_seen INTEGER NOT NULL,
                 avatar TEXT,
                 theme TEXT DEFAULT 'dark'
             )
@@ -75,14 +211,14 @@ class ChatServer:
         # Create messages table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS messages (
-                id TEXT PRIMARY KEY,
+                id INTEGER PRIMARY KEY,
                 user_id TEXT NOT NULL,
                 username TEXT NOT NULL,
                 content TEXT NOT NULL,
-                timestamp TEXT NOT NULL,
+                timestamp INTEGER NOT NULL,
                 message_type TEXT DEFAULT 'text',
                 attachments TEXT,
-                reply_to TEXT,
+                reply_to INTEGER,
                 room TEXT DEFAULT 'general'
             )
         ''')
@@ -95,61 +231,197 @@ class ChatServer:
             )
         ''')
         
+        self.migrate_epoch_columns(cursor)
+        self.migrate_message_ids(cursor)
+        
+        # Message ids are the rowid and already in time order, so this index is dead weight
+        cursor.execute("DROP INDEX IF EXISTS idx_messages_ts")
         conn.commit()
-        conn.close()
+        
+        self.last_message_id = cursor.execute("SELECT MAX(id) FROM messages").fetchone()[0] or 0
         
         # Load existing admin users
         self.load_admin_users()
     
+    def migrate_epoch_columns(self, cursor: sqlite3.Cursor):
+        """Rebuild tables from databases that stored datetimes as ISO text"""
+        # julianday(..., 'utc') reads the naive local ISO strings isoformat() produced
+        to_ms = "CAST(ROUND((julianday({0}, 'utc') - 2440587.5) * 86400000) AS INTEGER)"
+        tables = {
+            "users": ("connected_at", "last_seen"),
+            "messages": ("timestamp",),
+        }
+        for table, columns in tables.items():
+            info = cursor.execute(f"PRAGMA table_info({table})").fetchall()
+            types = {row[1]: row[2] for row in info}
+            if types[columns[0]] != "TEXT":
+                continue
+            logger.info(f"Converting {table} datetimes to epoch milliseconds")
+            schema = cursor.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+            ).fetchone()[0]
+            for column in columns:
+                schema = schema.replace(f"{column} TEXT", f"{column} INTEGER")
+            names = [row[1] for row in info]
+            selected = [to_ms.format(name) if name in columns else name for name in names]
+            cursor.execute(f"ALTER TABLE {table} RENAME TO {table}_old")
+            cursor.execute(schema.replace(f"TABLE {table}", f"TABLE IF NOT EXISTS {table}", 1))
+            cursor.execute(
+                f"INSERT INTO {table} ({', '.join(names)}) "
+                f"SELECT {', '.join(selected)} FROM {table}_old"
+            )
+            cursor.execute(f"DROP TABLE {table}_old")
+    
+    def migrate_message_ids(self, cursor: sqlite3.Cursor):
+        """Renumber messages saved with uuid text ids into time-ordered integer ids"""
+        info = cursor.execute("PRAGMA table_info(messages)").fetchall()
+        types = {row[1]: row[2] for row in info}
+        if types["id"] != "TEXT" and types["reply_to"] != "TEXT":
+            return
+        logger.info("Converting message ids to integers")
+        names = [row[1] for row in info]
+        rows = cursor.execute(
+            f"SELECT {', '.join(names)} FROM messages ORDER BY timestamp, rowid"
+        ).fetchall()
+        id_index = names.index("id")
+        timestamp_index = names.index("timestamp")
+        reply_index = names.index("reply_to")
+        new_ids = {}
+        last_id = 0
+        for row in rows:
+            if types["id"] == "TEXT":
+                last_id = max(row[timestamp_index] << MESSAGE_ID_SEQUENCE_BITS, last_id + 1)
+            else:
+                last_id = row[id_index]
+            new_ids[row[id_index]] = last_id
+            new_ids[str(row[id_index])] = last_id
+        
+        schema = cursor.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'messages'"
+        ).fetchone()[0]
+        cursor.execute("ALTER TABLE messages RENAME TO messages_old")
+        schema = schema.replace("id TEXT PRIMARY KEY", "id INTEGER PRIMARY KEY", 1)
+        cursor.execute(schema.replace("reply_to TEXT", "reply_to INTEGER", 1))
+        renumbered = []
+        for row in rows:
+            row = list(row)
+            row[id_index] = new_ids[row[id_index]]
+            # Replies to messages that no longer exist lose the dangling reference
+            row[reply_index] = new_ids.get(row[reply_index])
+            renumbered.append(row)
+        cursor.executemany(
+            f"INSERT INTO messages ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})",
+            renumbered
+        )
+        cursor.execute("DROP TABLE messages_old")
+    
+    def next_message_id(self, timestamp: datetime) -> int:
+        """Allocate a message id that sorts after every earlier one"""
+        candidate = to_epoch_ms(timestamp) << MESSAGE_ID_SEQUENCE_BITS
+        self.last_message_id = max(candidate, self.last_message_id + 1)
+        return self.last_message_id
+    
     def load_admin_users(self):
         """Load admin users from database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT user_id FROM admin_users")
-        admin_ids = cursor.fetchall()
-        self.admin_users = {row[0] for row in admin_ids}
-        conn.close()
+        self.admin_users = {row[0] for row in self.conn.execute(ADMIN_USER_IDS_SQL)}
     
     def save_user(self, user: User):
         """Save user to database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT OR REPLACE INTO users 
-            (id, username, role, connected_at, last_seen, avatar, theme)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            user.id, user.username, user.role.value,
-            user.connected_at.isoformat(), user.last_seen.isoformat(),
-            user.avatar, user.theme
-        ))
-        conn.commit()
-        conn.close()
+        self.conn.execute(USER_UPSERT_SQL, user_row(user))
+        self.conn.commit()
     
     def save_message(self, message: Message):
         """Save message to database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT INTO messages 
-            (id, user_id, username, content, timestamp, message_type, attachments, reply_to, room)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            message.id, message.user_id, message.username,
-            message.content, message.timestamp.isoformat(),
-            message.message_type, json.dumps(message.attachments or []),
-            message.reply_to, "general"
-        ))
+        self.conn.execute(MESSAGE_INSERT_SQL, message_row(message))
+        self.conn.commit()
+    
+    async def run_db(self, func, *args):
+        """Run a blocking database call on the database thread"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.db_executor, func, *args)
+    
+    def queue_user(self, user: User):
+        """Save user to database with the next batch (immediately if the flusher isn't running)"""
+        self.dirty_users.discard(user.id)
+        if self.write_queue is None:
+            self.save_user(user)
+        else:
+            # Snapshot the row now; the User object keeps changing
+            self.write_queue.put_nowait(("user", user_row(user)))
+    
+    def queue_message(self, message: Message):
+        """Save message to database with the next batch (immediately if the flusher isn't running)"""
+        if self.write_queue is None:
+            self.save_message(message)
+        else:
+            # Messages aren't modified after creation, so the database thread builds the row
+            self.write_queue.put_nowait(("message", message))
+    
+    def write_batch(self, batch: List[tuple]):
+        """Commit queued rows in a single transaction"""
+        users = {}
+        messages = []
+        for kind, item in batch:
+            if kind == "user":
+                users[item[0]] = item  # only the latest state of each user matters
+            else:
+                messages.append(message_row(item))
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(MESSAGE_INSERT_SQL, messages)
+            conn.executemany(USER_UPSERT_SQL, users.values())
+        except Exception:
+            conn.rollback()
+            raise
         conn.commit()
-        conn.close()
+    
+    async def db_flusher(self):
+        """Drain write_queue in batches until the None sentinel from start() arrives"""
+        queue = self.write_queue
+        running = True
+        while running:
+            batch = [await queue.get()]
+            await asyncio.sleep(DB_FLUSH_INTERVAL)
+            while len(batch) < DB_FLUSH_MAX_ROWS and not queue.empty():
+                batch.append(queue.get_nowait())
+            rows = [item for item in batch if item is not None]
+            running = len(rows) == len(batch)
+            try:
+                if rows:
+                    await self.run_db(self.write_batch, rows)
+            except Exception as e:
+                logger.error(f"Error writing {len(rows)} queued rows to database: {e}")
+            finally:
+                for _ in batch:
+                    queue.task_done()
+    
+    def count_messages(self) -> int:
+        """Count all stored messages"""
+        return self.conn.execute(MESSAGE_COUNT_SQL).fetchone()[0]
+    
+    def flush_dirty_users(self):
+        """Queue every user whose last_seen changed since it was last saved"""
+        for user_id in list(self.dirty_users):
+            user = self.users.get(user_id)
+            if user is None:
+                self.dirty_users.discard(user_id)
+            else:
+                self.queue_user(user)
+    
+    async def user_flusher(self):
+        """Periodically save last_seen updates instead of rewriting the user on every message"""
+        while True:
+            await asyncio.sleep(USER_FLUSH_INTERVAL)
+            self.flush_dirty_users()
     
     def load_messages(self, limit: int = 50) -> List[Message]:
         """Load recent messages from database"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.conn
         cursor = conn.cursor()
         cursor.execute('''
             SELECT id, user_id, username, content, timestamp, message_type, attachments, reply_to
-            FROM messages ORDER BY timestamp DESC LIMIT ?
+            FROM messages ORDER BY id DESC LIMIT ?
         ''', (limit,))
         
         messages = []
@@ -159,16 +431,54 @@ class ChatServer:
                 user_id=row[1],
                 username=row[2],
                 content=row[3],
-                timestamp=datetime.fromisoformat(row[4]),
+                timestamp=from_epoch_ms(row[4]),
                 message_type=row[5],
                 attachments=json.loads(row[6]) if row[6] else [],
                 reply_to=row[7]
             )
             messages.append(message)
         
-        conn.close()
         return list(reversed(messages))
     
+    def send_to(self, user_id: str, frame: str):
+        """Queue an encoded frame for a client without waiting on its socket"""
+        outbox = self.outboxes.get(user_id)
+        if outbox is not None:
+            self.push_frame(user_id, outbox, frame)
+    
+    def push_frame(self, user_id: str, outbox: asyncio.Queue, frame: str):
+        """Put a frame in an outbox, dropping its oldest frame when full"""
+        if outbox.full():
+            # A client this far behind only needs the newest frames
+            outbox.get_nowait()
+            logger.warning(f"Outbox full for {user_id}, dropping oldest frame")
+        outbox.put_nowait(frame)
+    
+    async def sender_loop(self, user_id: str, websocket: WebSocketServerProtocol, outbox: asyncio.Queue):
+        """Write queued frames to one client so a slow socket only delays itself"""
+        try:
+            while True:
+                frame = await outbox.get()
+                self.sending.add(user_id)
+                await websocket.send(frame)
+                self.sending.discard(user_id)
+        except asyncio.CancelledError:
+            raise
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        except Exception as e:
+            logger.error(f"Error sending to {user_id}: {e}")
+        finally:
+            self.sending.discard(user_id)
+        await self.remove_client(user_id)
+    
+    def is_idle(self, user_id: str, outbox: asyncio.Queue) -> bool:
+        """True when nothing is queued, in flight or still buffered for a client"""
+        if not outbox.empty() or user_id in self.sending:
+            return False
+        transport = getattr(self.clients.get(user_id), "transport", None)
+        return transport is not None and transport.get_write_buffer_size() == 0
+    
     async def register_client(self, websocket: WebSocketServerProtocol, username: str, role: UserRole = UserRole.USER):
         """Register a new client"""
         user_id = str(uuid.uuid4())
@@ -182,10 +492,14 @@ class ChatServer:
         
         self.clients[user_id] = websocket
         self.users[user_id] = user
+        self.online_users.add(user_id)
+        outbox = asyncio.Queue(maxsize=OUTBOX_MAX_FRAMES)
+        self.outboxes[user_id] = outbox
+        self.senders[user_id] = asyncio.create_task(self.sender_loop(user_id, websocket, outbox))
         self.rooms["general"].add(user_id)
         
         # Save user to database
-        self.save_user(user)
+        self.queue_user(user)
         
         # Send welcome message
         welcome_msg = {
@@ -193,7 +507,7 @@ class ChatServer:
             "content": f"Welcome {username}! You are now connected to the chat.",
             "timestamp": datetime.now().isoformat()
         }
-        await websocket.send(json.dumps(welcome_msg))
+        self.send_to(user_id, encode_frame(welcome_msg))
         
         # Broadcast user joined
         await self.broadcast({
@@ -206,12 +520,15 @@ class ChatServer:
             "timestamp": datetime.now().isoformat()
         }, exclude_user_id=user_id)
         
-        # Send recent messages
-        recent_messages = self.load_messages(20)
-        for msg in recent_messages:
-            await websocket.send(json.dumps({
-                "type": "message",
-                "message": asdict(msg)
+        # Send recent messages, including any still waiting in the write queue
+        if self.write_queue is not None:
+            await self.write_queue.join()
+        recent_messages = await self.run_db(self.load_messages, 20)
+        if recent_messages:
+            # One frame for the whole backlog rather than one per message
+            self.send_to(user_id, encode_frame({
+                "type": "history",
+                "messages": [msg.to_dict() for msg in recent_messages]
             }))
         
         logger.info(f"User {username} connected with ID {user_id}")
@@ -228,7 +545,7 @@ class ChatServer:
                 user_id = await self.register_client(websocket, username, role)
                 
                 # Send user info back
-                await websocket.send(json.dumps({
+                self.send_to(user_id, encode_frame({
                     "type": "user_registered",
                     "user_id": user_id,
                     "username": username,
@@ -246,48 +563,50 @@ class ChatServer:
                 if not content.strip():
                     return
                 
+                # Message ids are integers; clients may send the one they reply to as a string
+                reply_to = message_data.get("reply_to")
+                
                 # Create message
+                timestamp = datetime.now()
                 message = Message(
-                    id=str(uuid.uuid4()),
+                    id=self.next_message_id(timestamp),
                     user_id=user_id,
                     username=user.username,
                     content=content,
-                    timestamp=datetime.now(),
+                    timestamp=timestamp,
                     message_type=message_data.get("message_type", "text"),
                     attachments=message_data.get("attachments", []),
-                    reply_to=message_data.get("reply_to")
+                    reply_to=int(reply_to) if reply_to is not None else None
                 )
                 
                 # Save message
-                self.messages.append(message)
-                self.save_message(message)
+                self.queue_message(message)
                 
                 # Broadcast message
                 await self.broadcast({
                     "type": "message",
-                    "message": asdict(message)
+                    "message": message.to_dict()
                 })
                 
-                # Update user's last seen
+                # Update user's last seen; user_flusher saves it later
                 user.last_seen = datetime.now()
-                self.save_user(user)
+                self.dirty_users.add(user_id)
             
             elif msg_type == "typing":
                 user_id = message_data.get("user_id")
                 if user_id in self.users:
-                    await self.broadcast({
-                        "type": "typing",
-                        "user_id": user_id,
-                        "username": self.users[user_id].username,
-                        "is_typing": message_data.get("is_typing", True)
-                    }, exclude_user_id=user_id)
+                    await self.broadcast(typing_frame(
+                        user_id,
+                        self.users[user_id].username,
+                        bool(message_data.get("is_typing", True))
+                    ), exclude_user_id=user_id)
             
             elif msg_type == "theme_change":
                 user_id = message_data.get("user_id")
                 theme = message_data.get("theme", "dark")
                 if user_id in self.users:
                     self.users[user_id].theme = theme
-                    self.save_user(self.users[user_id])
+                    self.queue_user(self.users[user_id])
             
             elif msg_type == "admin_command":
                 user_id = message_data.get("user_id")
@@ -296,7 +615,7 @@ class ChatServer:
         
         except Exception as e:
             logger.error(f"Error handling message: {e}")
-            await websocket.send(json.dumps({
+            await websocket.send(encode_frame({
                 "type": "error",
                 "message": "An error occurred while processing your message"
             }))
@@ -325,16 +644,18 @@ class ChatServer:
             })
         
         elif cmd_type == "get_stats":
+            if self.write_queue is not None:
+                await self.write_queue.join()
             stats = {
                 "total_users": len(self.users),
-                "online_users": len([u for u in self.users.values() if u.is_online]),
-                "total_messages": len(self.messages),
+                "online_users": len(self.online_users),
+                "total_messages": await self.run_db(self.count_messages),
                 "admin_users": list(self.admin_users)
             }
             
             admin_ws = self.clients.get(admin_id)
             if admin_ws:
-                await admin_ws.send(json.dumps({
+                await admin_ws.send(encode_frame({
                     "type": "admin_stats",
                     "stats": stats
                 }))
@@ -342,7 +663,7 @@ class ChatServer:
     async def kick_user(self, user_id: str, reason: str):
         """Kick a user from the chat"""
         if user_id in self.clients:
-            await self.clients[user_id].send(json.dumps({
+            await self.clients[user_id].send(encode_frame({
                 "type": "kicked",
                 "reason": reason
             }))
@@ -354,34 +675,41 @@ class ChatServer:
         # Implementation for permanent ban
         await self.kick_user(user_id, f"Banned: {reason}")
     
-    async def broadcast(self, message: dict, exclude_user_id: str = None):
-        """Broadcast message to all connected clients"""
-        disconnected = []
-        
-        for user_id, websocket in self.clients.items():
-            if user_id != exclude_user_id:
-                try:
-                    await websocket.send(json.dumps(message))
-                except websockets.exceptions.ConnectionClosed:
-                    disconnected.append(user_id)
-                except Exception as e:
-                    logger.error(f"Error broadcasting to {user_id}: {e}")
-                    disconnected.append(user_id)
-        
-        # Remove disconnected clients
-        for user_id in disconnected:
-            await self.remove_client(user_id)
+    async def broadcast(self, message: Union[dict, str], exclude_user_id: str = None):
+        """Broadcast message (a payload or an already encoded frame) to all connected clients"""
+        # Encode once; each client's sender_loop writes the frame (and handles failures)
+        frame = message if isinstance(message, str) else encode_frame(message)
+        # Snapshot the targets once; put_nowait never yields, so nothing else runs mid-loop
+        targets = [(user_id, outbox) for user_id, outbox in self.outboxes.items()
+                   if user_id != exclude_user_id]
+        idle = []
+        for user_id, outbox in targets:
+            if HAVE_WS_BROADCAST and self.is_idle(user_id, outbox):
+                idle.append(self.clients[user_id])
+            else:
+                # Busy clients go through the outbox, which keeps their frames in order and
+                # caps what they can hold at OUTBOX_MAX_FRAMES
+                self.push_frame(user_id, outbox, frame)
+        # Clients with nothing pending get the frame written straight to their transports;
+        # websockets only skips connections that aren't open and never checks buffer sizes
+        if idle:
+            websockets.broadcast(idle, frame)
     
     async def remove_client(self, user_id: str):
         """Remove a client from the server"""
         if user_id in self.clients:
             del self.clients[user_id]
+        self.outboxes.pop(user_id, None)
+        sender = self.senders.pop(user_id, None)
+        if sender is not None and sender is not asyncio.current_task():
+            sender.cancel()
         
         if user_id in self.users:
             user = self.users[user_id]
             user.is_online = False
+            self.online_users.discard(user_id)
             user.last_seen = datetime.now()
-            self.save_user(user)
+            self.queue_user(user)
             
             # Remove from all rooms
             for room in self.rooms.values():
@@ -401,15 +729,13 @@ class ChatServer:
     
     async def handle_client(self, websocket: WebSocketServerProtocol, path: str):
         """Handle individual client connection"""
-        user_id = None
-        
         try:
             async for message in websocket:
                 try:
-                    data = json.loads(message)
+                    data = decode_frame(message)
                     await self.handle_message(websocket, data)
                 except json.JSONDecodeError:
-                    await websocket.send(json.dumps({
+                    await websocket.send(encode_frame({
                         "type": "error",
                         "message": "Invalid JSON format"
                     }))
@@ -419,21 +745,38 @@ class ChatServer:
         except Exception as e:
             logger.error(f"Error handling client: {e}")
         finally:
+            # Direct broadcasts never fail, so closed sockets are cleaned up here
+            user_id = next((uid for uid, ws in self.clients.items() if ws is websocket), None)
             if user_id:
                 await self.remove_client(user_id)
     
     async def start(self):
         """Start the WebSocket server"""
+        self.write_queue = asyncio.Queue()
+        flusher = asyncio.create_task(self.db_flusher())
+        user_flusher = asyncio.create_task(self.user_flusher())
         server = await websockets.serve(
             self.handle_client,
             self.host,
-            self.port
+            self.port,
+            # permessage-deflate would recompress every broadcast frame once per recipient
+            compression=None
         )
         
         logger.info(f"WebSocket server started on ws://{self.host}:{self.port}")
         
         # Keep the server running
-        await server.wait_closed()
+        try:
+            await server.wait_closed()
+        finally:
+            # Let the flusher commit everything still queued before closing the database
+            user_flusher.cancel()
+            self.flush_dirty_users()
+            self.write_queue.put_nowait(None)
+            await flusher
+            self.write_queue = None
+            await self.run_db(self.conn.close)
+            self.db_executor.shutdown()
 
 # Admin users setup
 ADMIN_USERS = {
@@ -441,36 +784,42 @@ ADMIN_USERS = {
     "moderator": "mod123"
 }
 
-def setup_admin_users():
+def setup_admin_users(conn: Optional[sqlite3.Connection] = None):
     """Setup admin users in the database"""
-    conn = sqlite3.connect("chat_database.db")
-    cursor = conn.cursor()
+    own_conn = conn is None
+    if own_conn:
+        conn = sqlite3.connect("chat_database.db")
     
+    admin_rows = []
+    user_rows = []
     for username, password in ADMIN_USERS.items():
         user_id = str(uuid.uuid4())
-        cursor.execute('''
-            INSERT OR REPLACE INTO admin_users (user_id, permissions)
-            VALUES (?, ?)
-        ''', (user_id, "all"))
+        now = datetime.now()
+        admin_rows.append((user_id, "all"))
         
         # Create admin user
-        cursor.execute('''
-            INSERT OR REPLACE INTO users 
-            (id, username, role, connected_at, last_seen, avatar, theme)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            user_id, username, UserRole.ADMIN.value,
-            datetime.now().isoformat(), datetime.now().isoformat(),
-            "", "dark"
-        ))
-    
-    conn.commit()
-    conn.close()
+        user_rows.append(user_row(User(
+            id=user_id, username=username, role=UserRole.ADMIN,
+            connected_at=now, last_seen=now
+        )))
+    
+    with conn:
+        conn.executemany(ADMIN_USER_INSERT_SQL, admin_rows)
+        conn.executemany(USER_UPSERT_SQL, user_rows)
+    
+    if own_conn:
+        conn.close()
 
 if __name__ == "__main__":
-    # Setup admin users
-    setup_admin_users()
-    
-    # Start server
+    # Start server; its connection creates the tables, then seeds the admin users
     server = ChatServer()
+    setup_admin_users(server.conn)
+    server.load_admin_users()
+    
+    # uvloop's libuv-based loop handles many sockets faster; it is optional (and absent on Windows)
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
     asyncio.run(server.start())
\ No newline at end of file